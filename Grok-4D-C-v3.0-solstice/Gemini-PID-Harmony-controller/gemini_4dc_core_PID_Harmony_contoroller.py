@@ -1,11 +1,13 @@
 import time
 import random
 
+import numpy as np
+
 class HarmonyPID:
     """
     4D-Cの心臓部：PID制御によるHarmony 0.89への収束ロジック
     """
-    def __init__(self, kp=0.2, ki=0.05, kd=0.1):
+    def __init__(self, kp=0.2, ki=0.05, kd=0.1, clock=time.time):
         self.Kp = kp  # 比例：目標への反応速度
         self.Ki = ki  # 積分：蓄積した誤差の修正
         self.Kd = kd  # 微分：急激な変化へのブレーキ
@@ -13,11 +15,15 @@ class HarmonyPID:
         self.target = 0.89  # 4D-C 臨界調和点
         self.prev_error = 0
         self.integral = 0
-        self.last_time = time.time()
+        self.clock = clock  # VirtualClock を渡せば壁時計に依存しない
+        self.last_time = clock()
 
-    def update(self, current_value):
-        now = time.time()
-        dt = now - self.last_time
+    def update(self, current_value, dt=None):
+        if dt is None:
+            now = self.clock()
+            dt = now - self.last_time
+        else:
+            now = self.last_time + dt
         if dt <= 0: dt = 1e-6
 
         # 誤差の計算
@@ -36,6 +42,188 @@ class HarmonyPID:
         
         return output
 
+class HarmonyPIDBank:
+    """
+    多数の HarmonyPID をまとめて配列で持ち、一回の呼び出しで N 本を同時に更新する
+    （クローナー一人ひとりの収束ループを、オブジェクトを作らずに回すため）
+
+    ゲイン・目標値はスカラーでも長さ N の配列でもよい。
+    integral_limit: 積分項の絶対値の上限（アンチワインドアップ）
+    output_limits: 出力の (下限, 上限)。飽和している方向には積分を進めない
+    clock: dt を渡さないときに使う時計（既定は time.time）
+    """
+    def __init__(self, n, kp=0.2, ki=0.05, kd=0.1, target=0.89,
+                 integral_limit=None, output_limits=None, clock=time.time):
+        self.n = n
+        self.Kp = np.broadcast_to(np.asarray(kp, dtype=float), (n,)).copy()
+        self.Ki = np.broadcast_to(np.asarray(ki, dtype=float), (n,)).copy()
+        self.Kd = np.broadcast_to(np.asarray(kd, dtype=float), (n,)).copy()
+        self.target = np.broadcast_to(np.asarray(target, dtype=float), (n,)).copy()
+
+        self.integral_limit = integral_limit
+        self.output_limits = output_limits
+        self.clock = clock
+
+        self.prev_error = np.zeros(n)
+        self.integral = np.zeros(n)
+        self.last_time = np.full(n, float(clock()))
+
+    def reset(self, index=None):
+        """index（省略時は全部）のループの内部状態を初期化"""
+        index = slice(None) if index is None else index
+        self.prev_error[index] = 0
+        self.integral[index] = 0
+        self.last_time[index] = self.clock()
+
+    def update(self, current_values, dt=None):
+        """
+        current_values: 長さ N の現在値
+        dt: 経過時間（スカラー or 長さ N）。省略時は clock() から各ループの前回時刻との差を使う
+        戻り値: 長さ N の制御量
+        """
+        current_values = np.asarray(current_values, dtype=float)
+        if dt is None:
+            now = self.clock()
+            dt = now - self.last_time
+            self.last_time[:] = now
+        else:
+            self.last_time += dt
+        dt = np.maximum(dt, 1e-6)
+
+        # 誤差の計算
+        error = self.target - current_values
+
+        # PID 各項の計算
+        integral = self.integral + error * dt
+        if self.integral_limit is not None:
+            np.clip(integral, -self.integral_limit, self.integral_limit, out=integral)
+        derivative = (error - self.prev_error) / dt
+
+        output = (self.Kp * error) + (self.Ki * integral) + (self.Kd * derivative)
+
+        if self.output_limits is not None:
+            low, high = self.output_limits
+            clipped = np.clip(output, low, high)
+            # 飽和していて、さらに同じ向きに積分が進む場合は積分を据え置く
+            winding = (clipped != output) & (np.sign(error) == np.sign(output))
+            integral = np.where(winding, self.integral, integral)
+            output = clipped
+
+        # 次回への保存
+        self.integral = integral
+        self.prev_error = error
+
+        return output
+
+class VirtualClock:
+    """シミュレーション用の時計（advance() した分だけ進む）"""
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, dt):
+        self.now += dt
+        return self.now
+
+def simulate_harmony(steps=10000, n_runs=1, dt=0.1, seed=0,
+                     kp=0.2, ki=0.05, kd=0.1, target=0.89,
+                     initial=0.1, noise=0.05, tolerance=0.001,
+                     stop_when_converged=False, record_every=1,
+                     integral_limit=None, output_limits=None, noise_streams=None,
+                     divergence_limit=1e6):
+    """
+    run_simulation() と同じ更新則を、仮想時間で眠らずに回す（n_runs 本を同時に）
+
+    - 乱数は seed で固定（同じ引数なら同じ結果）
+    - steps が上限。stop_when_converged=True なら全ランが一度 tolerance 以内に入る（か発散する）と止める
+      （そのとき final / peak は止めたステップまでの値。ランの組み合わせで変わるので、
+      設定どうしを比べるときは止めずに steps まで回す）
+    - |harmony| が divergence_limit を超えるか有限でなくなったランは発散とみなし、
+      その直前の値で止める（以降は更新しない。溢れや nan を出さずに diverged で知らせる）
+    - ゲインはスカラーでも長さ n_runs の配列でもよい（パラメータスイープ用）
+    - noise_streams=R を渡すと、ノイズ列を R 本だけ作り、ラン i には i % R 本目を使う
+      （ゲインの組ごとに R 本ずつ並べれば、どの組も同じノイズで比べられる）
+
+    戻り値（dict）:
+        time: (記録点,) の仮想時刻
+        harmony: (記録点, n_runs) の軌跡（record_every ステップごと）
+        converged_step: (n_runs,) 初めて |harmony - target| < tolerance になったステップ（無ければ -1）
+        final: (n_runs,) 最後のステップでの harmony（記録間隔によらない）
+        peak: (n_runs,) 軌跡の最大値（オーバーシュートの評価用、記録間隔によらない）
+        diverged: (n_runs,) 発散したランなら True
+        diverged_step: (n_runs,) 発散したステップ（しなければ -1）
+        steps: 実際に回したステップ数
+    """
+    rng = np.random.default_rng(seed)
+    clock = VirtualClock()
+    bank = HarmonyPIDBank(n_runs, kp=kp, ki=ki, kd=kd, target=target,
+                          integral_limit=integral_limit, output_limits=output_limits,
+                          clock=clock)
+    harmony = np.full(n_runs, float(initial))
+    converged_step = np.full(n_runs, -1, dtype=np.int64)
+    diverged_step = np.full(n_runs, -1, dtype=np.int64)
+    diverged = np.zeros(n_runs, dtype=bool)
+    peak = harmony.copy()
+    if noise_streams is None:
+        noise_streams = n_runs
+    elif n_runs % noise_streams:
+        raise ValueError("n_runs must be a multiple of noise_streams")
+    repeat = n_runs // noise_streams
+
+    n_records = steps // record_every + 1
+    times = np.empty(n_records)
+    trajectory = np.empty((n_records, n_runs))
+    times[0] = clock()
+    trajectory[0] = harmony
+    recorded = 1
+
+    chunk = 4096
+    step = 0
+    while step < steps:
+        # ノイズはまとめて生成（run_simulation と同じ ±noise/2 の一様乱数）
+        block = (rng.random((min(chunk, steps - step), noise_streams)) - 0.5) * noise
+        if repeat > 1:
+            block = np.tile(block, repeat)
+        for row in block:
+            clock.advance(dt)
+            proposed = harmony + bank.update(harmony, dt=dt) + row
+            step += 1
+
+            # 発散したランは直前の値のまま止める
+            exploded = ~(np.abs(proposed) <= divergence_limit)  # nan も拾う
+            if exploded.any():
+                diverged_step[exploded & ~diverged] = step
+                diverged |= exploded
+            np.copyto(harmony, proposed, where=~diverged)
+            np.fmax(peak, harmony, out=peak)
+
+            near = np.abs(harmony - bank.target) < tolerance
+            converged_step[near & (converged_step < 0)] = step
+
+            if step % record_every == 0:
+                times[recorded] = clock()
+                trajectory[recorded] = harmony
+                recorded += 1
+
+            if stop_when_converged and ((converged_step >= 0) | diverged).all():
+                break
+        else:
+            continue
+        break
+
+    return {
+        "time": times[:recorded],
+        "harmony": trajectory[:recorded],
+        "converged_step": converged_step,
+        "final": harmony,
+        "peak": peak,
+        "diverged": diverged,
+        "diverged_step": diverged_step,
+        "steps": step,
+    }
+
 def run_simulation():
     # 4D-C システムの初期化
     core = HarmonyPID()
@@ -67,7 +255,19 @@ def run_simulation():
         print("\n--- 4D-C Core System Suspended ---")
 
 if __name__ == "__main__":
-    run_simulation()
+    import sys
+
+    if "--fast" in sys.argv:
+        # 仮想時間での早回し（1000本 × 1000ステップ）
+        start = time.perf_counter()
+        result = simulate_harmony(steps=1000, n_runs=1000, seed=89)
+        elapsed = time.perf_counter() - start
+        converged = result["converged_step"] >= 0
+        print(f"{result['steps'] * 1000} steps in {elapsed:.2f}s")
+        print(f"converged runs: {converged.sum()} / {converged.size}")
+        print(f"diverged runs: {result['diverged'].sum()} / {converged.size}")
+    else:
+        run_simulation()
 
 
-SPDX-License-Identifier: MIT
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,256 @@
+# bench_resonance.py
+# 4D-C v3.0: Resonance Pipeline Benchmark
+# Role: パイプラインの各段と全体のレイテンシ・スループットを測り、JSONで残す
+#
+# 使い方:
+#     python bench_resonance.py                       # 測定して bench_results.json に保存
+#     python bench_resonance.py --quick               # 回数を減らして手早く
+#     python bench_resonance.py --compare old.json    # 前回と比べ、悪化していれば終了コード1
+#
+# 起動時間: `4dc process 0.7` 相当を新しいプロセスで何度か起動して壁時計時間を測り、
+# p50 が --startup-budget-ms を超えたら終了コード1（スカラーの経路で NumPy を読み込んでいないかも記録する）
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from claude_silence_oracle import ClaudeSilenceOracle
+from gemini_oracle import GeminiOracle
+from grok_4dc_v3_solstice import Grok4DCEngine, MariStage
+from sme_mapper import determine_sme_params
+from visualizer_harmony import BAND_STATES, generate_visualizer
+from chladni_renderer import ChladniRenderer
+from sme_synth import SMESynth
+from cohort_oracle import CohortOracle
+
+BATCH_SIZES = (1, 100, 10000)
+STARTUP_BUDGET_MS = 150.0
+STARTUP_ARGS = ["process", "0.7"]
+
+
+def _percentile(samples: List[int], q: float) -> float:
+    return float(np.percentile(samples, q))
+
+
+def _allocations(call: Callable[[], object], n: int) -> Dict[str, float]:
+    """1回あたりの一時的なメモリ確保量（tracemalloc のピーク）と、呼び出し後に残ったブロック数"""
+    call()  # キャッシュ類を温めておく
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(n):
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        call()
+        peak_total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return {
+        "peak_bytes_per_call": peak_total / n,
+        "retained_blocks_per_call": (sys.getallocatedblocks() - blocks_before) / n,
+    }
+
+
+def bench_call(name: str, call: Callable[[], object], n: int, items_per_call: int = 1) -> Dict:
+    """call を n 回呼び、1回ごとの時間から p50/p99 などを出す"""
+    for _ in range(min(n, 100)):
+        call()
+    timings = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(n):
+        t0 = clock()
+        call()
+        timings.append(clock() - t0)
+    total_s = (clock() - start) / 1e9
+
+    result = {
+        "name": name,
+        "calls": n,
+        "items_per_call": items_per_call,
+        "p50_us": _percentile(timings, 50) / 1e3,
+        "p99_us": _percentile(timings, 99) / 1e3,
+        "mean_us": sum(timings) / n / 1e3,
+        "items_per_s": n * items_per_call / total_s,
+    }
+    result.update(_allocations(call, max(1, min(n, 1000))))
+    return result
+
+
+def build_cases(n: int) -> List[Dict]:
+    rng = random.Random(432)
+    c_values = [rng.uniform(0.1, 0.99) for _ in range(1024)]
+    cursor = [0]
+
+    def next_c() -> float:
+        cursor[0] = (cursor[0] + 1) & 1023
+        return c_values[cursor[0]]
+
+    oracle = GeminiOracle()
+    claude = ClaudeSilenceOracle()
+    engine = Grok4DCEngine()
+    table_engine = Grok4DCEngine(precompile_resolution=50000)
+    response = engine.process(simulated_c=0.7)
+    stages = [s.value for s in MariStage]
+
+    results = [
+        bench_call("gemini.calculate_harmony",
+                   lambda: oracle.calculate_harmony(next_c(), 0.5, 0.3), n),
+        bench_call("claude.process",
+                   lambda: claude.process(orah=next_c(), humility=0.9, anxiety=0.2), n),
+        bench_call("grok.process",
+                   lambda: engine.process(simulated_c=next_c()), n),
+        bench_call("grok.process[precompiled]",
+                   lambda: table_engine.process(simulated_c=next_c()), n),
+        bench_call("grok.to_json",
+                   lambda: engine.to_json(response), n),
+        bench_call("grok.to_json_compact",
+                   lambda: engine.to_json(response, compact=True), n),
+        bench_call("sme.determine_sme_params",
+                   lambda: determine_sme_params(next_c(), stages[cursor[0] & 3]), n),
+        bench_call("visualizer.generate_visualizer",
+                   lambda: generate_visualizer(None, next_c(), next_c()), n),
+    ]
+
+    renderer = ChladniRenderer(512, 512)
+    frame_index = [0]
+
+    def render_frame():
+        frame_index[0] += 1
+        return renderer.render(BAND_STATES[(frame_index[0] // 30) & 3], frame_index[0] / 60)
+
+    results.append(bench_call("chladni.render[512x512]", render_frame, min(n, 2000)))
+
+    synth = SMESynth(64)
+    results.append(bench_call("sme_synth.render_pcm_block[64x1024]", synth.render_pcm_block, min(n, 2000)))
+
+    np_rng = np.random.default_rng(432)
+    cohort = CohortOracle(oracle)
+    cohort_size = 100_000
+    cohort.load(range(cohort_size), *np_rng.uniform(0.0, 1.0, (3, cohort_size)))
+
+    member = [0]
+
+    def update_member():
+        member[0] = (member[0] + 7919) % cohort_size  # 全員に散らして更新する
+        c = next_c()
+        return cohort.update(member[0], c, 0.5, 1 - c)
+
+    results.append(bench_call("cohort.update[100k]", update_member, n))
+    results.append(bench_call("cohort.summary[100k]", cohort.summary, min(n, 2000)))
+
+    for size in BATCH_SIZES:
+        batch = np_rng.uniform(0.1, 0.99, size)
+        calls = max(3, min(n, 200_000 // size))
+        results.append(bench_call(f"grok.process_batch[{size}]",
+                                  lambda: engine.process_batch(batch), calls, size))
+    return results
+
+
+def bench_startup(runs: int) -> Dict:
+    """fourdc_cli を runs 回新しいプロセスで起動し、一回ごとの壁時計時間（インタプリタの起動込み）を測る"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    command = [sys.executable, "-m", "fourdc_cli"] + STARTUP_ARGS
+    timings = []
+    for _ in range(runs):
+        t0 = time.perf_counter_ns()
+        subprocess.run(command, cwd=here, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter_ns() - t0)
+
+    # 同じ呼び出しのあとに NumPy が読み込まれているか（遅延読み込みが崩れていないか）
+    probe = ("import sys, fourdc_cli; fourdc_cli.main(%r); "
+             "sys.stderr.write(str('numpy' in sys.modules))" % STARTUP_ARGS)
+    loaded = subprocess.run([sys.executable, "-c", probe], cwd=here, check=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return {
+        "command": " ".join(["4dc"] + STARTUP_ARGS),
+        "runs": runs,
+        "p50_ms": _percentile(timings, 50) / 1e6,
+        "min_ms": min(timings) / 1e6,
+        "max_ms": max(timings) / 1e6,
+        "loads_numpy": loaded.stderr.strip() == "True",
+    }
+
+
+def compare(current: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """p50 と スループットが tolerance 以上悪化したケースを返す"""
+    old = {r["name"]: r for r in baseline}
+    regressions = []
+    for r in current:
+        before = old.get(r["name"])
+        if before is None:
+            continue
+        slower = r["p50_us"] / before["p50_us"] - 1 if before["p50_us"] else 0.0
+        fewer = 1 - r["items_per_s"] / before["items_per_s"] if before["items_per_s"] else 0.0
+        print(f"  {r['name']:<34} p50 {before['p50_us']:9.2f} -> {r['p50_us']:9.2f} us "
+              f"({slower:+.1%})  throughput {-fewer:+.1%}")
+        if slower > tolerance or fewer > tolerance:
+            regressions.append(r["name"])
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="4D-C resonance pipeline benchmark")
+    parser.add_argument("-n", "--calls", type=int, default=20000, help="スカラー呼び出しの回数")
+    parser.add_argument("--quick", action="store_true", help="回数を減らす")
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="比較する過去の結果JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="悪化とみなす割合")
+    parser.add_argument("--startup-runs", type=int, default=None, help="起動時間を測る回数（0で測らない）")
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="起動時間（p50）の上限")
+    args = parser.parse_args(argv)
+
+    n = 2000 if args.quick else args.calls
+    results = build_cases(n)
+    startup_runs = args.startup_runs if args.startup_runs is not None else (5 if args.quick else 20)
+    startup = bench_startup(startup_runs) if startup_runs > 0 else None
+
+    print(f"{'case':<34} {'p50 us':>10} {'p99 us':>10} {'items/s':>14} {'peak B/call':>12}")
+    for r in results:
+        print(f"{r['name']:<34} {r['p50_us']:10.2f} {r['p99_us']:10.2f} "
+              f"{r['items_per_s']:14.0f} {r['peak_bytes_per_call']:12.0f}")
+    if startup is not None:
+        print(f"\nstartup: {startup['command']}  p50 {startup['p50_ms']:.1f} ms "
+              f"(min {startup['min_ms']:.1f} / max {startup['max_ms']:.1f}, budget "
+              f"{args.startup_budget_ms:.0f} ms)  numpy loaded: {startup['loads_numpy']}")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+        "startup": startup,
+    }
+    with open(args.output, "w", encoding="utf-8") as fp:
+        json.dump(report, fp, indent=2)
+    print(f"\nsaved: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fp:
+            baseline = json.load(fp)["results"]
+        print(f"\ncompare with {args.compare}:")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nregressions: {', '.join(regressions)}")
+            return 1
+    if startup is not None and startup["p50_ms"] > args.startup_budget_ms:
+        print(f"\nstartup over budget: {startup['p50_ms']:.1f} ms > {args.startup_budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,263 @@
+# chladni_renderer.py
+# 4D-C v3.0: Chladni Frame Renderer
+# Role: ビジュアライザーの状態（VisualizerState）の流れを、クラドニ図形の画像（uint8 配列 / PPM / PNG）にする
+#
+# 正方形の板のクラドニ図形は、固有モードの差 cos(nπx)cos(mπy) - cos(mπx)cos(nπy) の節線（振幅 0）に
+# 砂が集まった模様として近似できる。モードの重ね合わせ u は、x 方向と y 方向の cos の表
+# （固有モードの基底。大きさごとに一度だけ作る）と、モードの組の重みを並べた小さな係数行列 C で
+#     u = BY.T @ C @ BX        （BY: (K, H), BX: (K, W), C: (K, K)）
+# と行列積二回で求まる。明るさは節線からの距離で 255 * (1 - |u| / 線幅) を 0〜255 に切ったもの。
+#
+# 状態から描き方への対応:
+#   focus_point  高いほど重ねるモードの組が少なく、節線が細い（1.0 で一つのモードだけの整った図形）
+#   noise_level  砂のざらつき（前もって作ったノイズ画像を足す）
+#   motion_speed 各モードの重みが揺れる速さ（時刻 t の関数。0.05 ならほぼ静止）
+#   color_spread color=True のときの色相の広がり（帯域ごとの色から、暗いほど色相をずらす）
+#
+# 出力バッファは使い回す: render() の戻り値は次の render() で上書きされる（残すなら copy するか out を渡す）。
+# 一コアで 512x512 を 60 fps 以上（`python chladni_renderer.py` で測れる）。
+
+import argparse
+import colorsys
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from visualizer_harmony import BAND_STATES, VisualizerState, VisualMode
+
+# 重ねるモードの組 (n, m)（focus_point が高いほど先頭の少数だけを使う）
+MODE_PAIRS = ((3, 5), (2, 7), (1, 4), (4, 7), (1, 6), (5, 8), (2, 3), (3, 8))
+MAX_ORDER = 9  # 基底に持つ cos(kπx) の k の数（0〜8）
+
+# 帯域ごとの色相（0〜1。最も明るい画素の色。暗くなるほど color_spread の幅でずらす）
+MODE_HUES = {
+    VisualMode.CHAOTIC.value: 0.0,    # 赤
+    VisualMode.FLOW.value: 0.08,      # 橙
+    VisualMode.COHERENT.value: 0.5,   # 青緑
+    VisualMode.STILL.value: 0.14,     # 金（ほぼ白）
+}
+
+MOTION_HZ = 1.0      # motion_speed=1.0 のときの重みの揺れ（Hz）
+NOISE_TEXTURES = 4   # 使い回すノイズ画像の枚数
+
+
+@lru_cache(maxsize=None)
+def _basis(n: int) -> np.ndarray:
+    """cos(kπx)（k=0..MAX_ORDER-1、x は画素の中心）。(MAX_ORDER, n) の float32"""
+    x = (np.arange(n) + 0.5) / n
+    return np.cos(np.pi * np.arange(MAX_ORDER)[:, None] * x[None, :]).astype(np.float32)
+
+
+@lru_cache(maxsize=None)
+def _palette(mode: str, color_spread: float) -> np.ndarray:
+    """明るさ（0〜255）→ RGB の表（(256, 3) uint8）"""
+    hue = MODE_HUES.get(mode, 0.0)
+    saturation = 0.15 + 0.75 * color_spread
+    lut = np.empty((256, 3), dtype=np.uint8)
+    for i in range(256):
+        v = i / 255
+        r, g, b = colorsys.hsv_to_rgb((hue + 0.5 * color_spread * (1 - v)) % 1.0, saturation * (1 - v * 0.5), v)
+        lut[i] = (round(r * 255), round(g * 255), round(b * 255))
+    return lut
+
+
+def mode_coefficients(state: VisualizerState, t: float) -> Tuple[np.ndarray, float, float]:
+    """
+    状態と時刻から、係数行列 C（(MAX_ORDER, MAX_ORDER) float32）、|u| の上限、線幅を返す
+    """
+    count = 1 + int(round((1.0 - state.focus_point) * (len(MODE_PAIRS) - 1)))
+    phase = 2 * math.pi * MOTION_HZ * state.motion_speed * t
+    coefficients = np.zeros((MAX_ORDER, MAX_ORDER), dtype=np.float32)
+    norm = 0.0
+    for k, (n, m) in enumerate(MODE_PAIRS[:count]):
+        # 組ごとに揺れの速さと位相をずらす（一つだけのときも振幅は 0 にしない）
+        a = (0.6 + 0.4 * math.cos(phase * (1 + 0.37 * k) + 1.7 * k)) / (1 + k)
+        coefficients[m, n] += a
+        coefficients[n, m] -= a
+        norm += 2 * abs(a)
+    width = 0.03 + 0.12 * (1.0 - state.focus_point)
+    return coefficients, norm, width
+
+
+class ChladniRenderer:
+    """
+    renderer = ChladniRenderer(512, 512)
+    frame = renderer.render(state, t)                 # (H, W) uint8（内部バッファ）
+    rgb = renderer.render(state, t, color=True)       # (H, W, 3) uint8
+    frames = renderer.render_batch(states, times)     # (F, H, W) uint8
+    for frame in renderer.stream(states, fps=60): ...
+    """
+
+    def __init__(self, width: int = 512, height: int = 512, seed: int = 0):
+        self.width = width
+        self.height = height
+        self._bx = _basis(width)                                 # (K, W)
+        self._byt = np.ascontiguousarray(_basis(height).T)       # (H, K)
+        rng = np.random.default_rng(seed)
+        # 砂のざらつき（-1〜1）。毎フレーム乱数を作らず、数枚を順に使う
+        self._noise = rng.uniform(-1.0, 1.0, (NOISE_TEXTURES, height, width)).astype(np.float32)
+        self._field = np.empty((height, width), dtype=np.float32)
+        self._scratch = np.empty((height, width), dtype=np.float32)   # ノイズを倍率つきで置く
+        self._gray = np.empty((height, width), dtype=np.uint8)
+        self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self._batch_field: Optional[np.ndarray] = None
+        self.frames_rendered = 0
+
+    # ---------- 一枚 ----------
+
+    def render(self, state: VisualizerState, t: float = 0.0, color: bool = False,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """state を時刻 t で描く（out を渡せばそこに書く。省略時は内部バッファを返す）"""
+        coefficients, norm, width = mode_coefficients(state, t)
+        field = self._field
+        np.matmul(self._byt, coefficients @ self._bx, out=field)
+        self._shade(field, norm, width, state.noise_level, self.frames_rendered)
+        self.frames_rendered += 1
+        return self._finish(field, state, color, out)
+
+    def _shade(self, field: np.ndarray, norm: float, width: float, noise_level: float, index: int):
+        # 255 * (1 - |u| / (norm * width)) + ノイズ を 0〜255 に
+        np.abs(field, out=field)
+        field *= np.float32(-255.0 / (norm * width)) if norm > 0 else np.float32(0.0)
+        field += np.float32(255.0)
+        if noise_level > 0:
+            scratch = self._scratch
+            np.multiply(self._noise[index % NOISE_TEXTURES], np.float32(96.0 * noise_level), out=scratch)
+            field += scratch
+        np.clip(field, 0.0, 255.0, out=field)
+
+    def _finish(self, field: np.ndarray, state: VisualizerState, color: bool,
+                out: Optional[np.ndarray]) -> np.ndarray:
+        if not color:
+            gray = self._gray if out is None else out
+            np.copyto(gray, field, casting="unsafe")
+            return gray
+        np.copyto(self._gray, field, casting="unsafe")
+        rgb = self._rgb if out is None else out
+        np.take(_palette(state.mode, state.color_spread), self._gray, axis=0, out=rgb)
+        return rgb
+
+    # ---------- まとめて ----------
+
+    def render_batch(self, states: Sequence[VisualizerState], times: Sequence[float],
+                     color: bool = False, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        states[i] を times[i] で描いた F 枚をまとめて返す（(F, H, W) または (F, H, W, 3) uint8）
+        行列積は F 枚ぶんを一度に行う（作業用バッファは最大の F に合わせて使い回す）
+        """
+        n = len(states)
+        if len(times) != n:
+            raise ValueError("states and times must have the same length")
+        if out is None:
+            shape = (n, self.height, self.width) + ((3,) if color else ())
+            out = np.empty(shape, dtype=np.uint8)
+        if n == 0:
+            return out
+        if self._batch_field is None or len(self._batch_field) < n:
+            self._batch_field = np.empty((n, self.height, self.width), dtype=np.float32)
+        fields = self._batch_field[:n]
+
+        params = [mode_coefficients(state, t) for state, t in zip(states, times)]
+        coefficients = np.stack([c for c, _, _ in params])               # (F, K, K)
+        np.matmul(self._byt, coefficients @ self._bx, out=fields)        # (H, K) @ (F, K, W)
+        for i, (state, (_, norm, width)) in enumerate(zip(states, params)):
+            self._shade(fields[i], norm, width, state.noise_level, self.frames_rendered)
+            self.frames_rendered += 1
+            self._finish(fields[i], state, color, out[i])
+        return out
+
+    def stream(self, states: Iterable[VisualizerState], fps: float = 60.0,
+               color: bool = False, t0: float = 0.0) -> Iterator[np.ndarray]:
+        """状態の流れを 1/fps 秒ごとのフレームにする（各フレームは内部バッファ。次の next() で上書き）"""
+        for i, state in enumerate(states):
+            yield self.render(state, t0 + i / fps, color=color)
+
+
+# ---------- 書き出し ----------
+
+def write_ppm(path: str, frame: np.ndarray):
+    """(H, W) は P5（グレー）、(H, W, 3) は P6（RGB）で書く"""
+    kind = b"P6" if frame.ndim == 3 else b"P5"
+    with open(path, "wb") as fp:
+        fp.write(b"%s\n%d %d\n255\n" % (kind, frame.shape[1], frame.shape[0]))
+        fp.write(np.ascontiguousarray(frame).tobytes())
+
+
+def encode_png(frame: np.ndarray, level: int = 1) -> bytes:
+    """(H, W) / (H, W, 3) uint8 を PNG に（標準ライブラリの zlib だけで、フィルタなし）"""
+    height, width = frame.shape[:2]
+    color_type = 2 if frame.ndim == 3 else 0
+    rows = np.empty((height, 1 + frame[0].size), dtype=np.uint8)
+    rows[:, 0] = 0  # 各行のフィルタ種別（なし）
+    rows[:, 1:] = frame.reshape(height, -1)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(rows.tobytes(), level)) + chunk(b"IEND", b""))
+
+
+def write_png(path: str, frame: np.ndarray, level: int = 1):
+    with open(path, "wb") as fp:
+        fp.write(encode_png(frame, level))
+
+
+# ---------- 速度の確認 ----------
+
+def measure_fps(renderer: ChladniRenderer, frames: int, color: bool = False,
+                batch: int = 0) -> Dict[str, float]:
+    """帯域の状態を順に回しながら frames 枚描き、一枚あたりの時間と fps を返す"""
+    states = [BAND_STATES[(i // 30) % len(BAND_STATES)] for i in range(frames)]
+    times = [i / 60.0 for i in range(frames)]
+    start = time.perf_counter()
+    if batch > 0:
+        out = np.empty((batch, renderer.height, renderer.width) + ((3,) if color else ()), dtype=np.uint8)
+        for i in range(0, frames, batch):
+            chunk = states[i:i + batch]
+            renderer.render_batch(chunk, times[i:i + batch], color=color, out=out[:len(chunk)])
+    else:
+        for frame in renderer.stream(states, fps=60.0, color=color):
+            pass
+    elapsed = time.perf_counter() - start
+    return {"frames": frames, "ms_per_frame": elapsed / frames * 1e3, "fps": frames / elapsed}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Chladni frame renderer")
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--color", action="store_true", help="RGB で描く")
+    parser.add_argument("--batch", type=int, default=0, help="render_batch() の枚数（0 なら一枚ずつ）")
+    parser.add_argument("--write", metavar="DIR", help="帯域ごとに一枚ずつ PNG を書き出す")
+    args = parser.parse_args(argv)
+
+    renderer = ChladniRenderer(args.size, args.size)
+    result = measure_fps(renderer, args.frames, color=args.color, batch=args.batch)
+    print(f"{args.size}x{args.size} {'rgb' if args.color else 'gray'}"
+          f"{f' batch={args.batch}' if args.batch else ''}: "
+          f"{result['ms_per_frame']:.2f} ms/frame, {result['fps']:.1f} fps")
+
+    if args.write:
+        os.makedirs(args.write, exist_ok=True)
+        for state in BAND_STATES:
+            path = os.path.join(args.write, f"chladni_{state.mode}.png")
+            write_png(path, renderer.render(state, 0.0, color=True))
+            print(f"saved: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# SPDX-License-Identifier: MIT
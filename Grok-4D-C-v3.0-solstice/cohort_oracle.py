@@ -0,0 +1,414 @@
+# cohort_oracle.py
+# 4D-C v3.0: Cohort Harmony Oracle
+# Role: 大勢の参加者（115人のクローナー、それ以上も）の最新の三つの値から、集団の調和・段階の分布・外れ値を出す
+#
+# 参加者ごとに最新の (C値, 静寂スコア, ビジュアル密度) を一組だけ持ち、更新のたびに集計を差分で直す。
+# 一回の更新は参加者数 N によらない（O(log B)、B は harmony のヒストグラムのビン数）:
+# - 平均（C値・静寂・密度・harmony）と harmony の分散: 和と二乗和を差し替える。
+#   丸め誤差が溜まらないよう、N 回（最低 RESYNC_MIN 回）更新するごとに math.fsum で取り直す（ならして O(1)）
+# - 段階の分布: GROK_STAGE_TABLE の区間ごとの人数
+# - harmony の分布: ビンごとの人数を Fenwick 木（二分索引木）で持つ。分位点とビンより下の人数が O(log B)
+#   ビンごとに参加者の ID の集合も持つので、外れ値（平均から outlier_z 標準偏差より離れた人）は
+#   O(B + 外れ値の人数) で列挙できる（境目のビンだけ実際の値で振り分けるので、列挙と人数は正確）
+# 分位点だけはビンの中央の値を返す（誤差は高々 1 / (2B)）。
+#
+# 冬至フラグが変わると全員の harmony が変わるので、そのときだけ全員ぶん取り直す（O(N)、配列版で）。
+# 一度にまとめて入れるときは load()（配列版で O(N)）。一コアで 10 万人が 0.1 秒ほどで入り、更新は一回 10 マイクロ秒ほど。
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from gemini_oracle import GeminiOracle
+from lazy_import import LazyModule
+from stage_tables import GROK_STAGE_TABLE
+
+np = LazyModule("numpy")
+
+HARMONY_BINS = 1024
+RESYNC_MIN = 1024  # 和を取り直すまでの最小の更新回数
+
+
+class HarmonyHistogram:
+    """
+    ビンごとの人数を持つ Fenwick 木（ビン i は [i/B, (i+1)/B)。両端のビンは範囲外の値も受ける）
+    add / count_below / find はどれも O(log B)
+    """
+
+    __slots__ = ("bins", "_tree", "total")
+
+    def __init__(self, bins: int = HARMONY_BINS):
+        if bins < 1:
+            raise ValueError("bins must be >= 1")
+        self.bins = bins
+        self._tree = [0] * (bins + 1)
+        self.total = 0
+
+    def bin_of(self, value: float) -> int:
+        return min(max(int(value * self.bins), 0), self.bins - 1)
+
+    def add(self, index: int, delta: int = 1):
+        self.total += delta
+        tree = self._tree
+        i = index + 1
+        while i <= self.bins:
+            tree[i] += delta
+            i += i & -i
+
+    def count_below(self, index: int) -> int:
+        """ビン 0〜index-1 の人数"""
+        tree = self._tree
+        total = 0
+        i = index
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, rank: int) -> int:
+        """小さい方から rank 番目（0 始まり）の人がいるビン"""
+        tree = self._tree
+        index = 0
+        step = 1 << self.bins.bit_length()
+        while step:
+            nxt = index + step
+            if nxt <= self.bins and tree[nxt] <= rank:
+                index = nxt
+                rank -= tree[nxt]
+            step >>= 1
+        return index
+
+    def load(self, counts: Sequence[int]):
+        """ビンごとの人数から O(B) で作り直す"""
+        if len(counts) != self.bins:
+            raise ValueError("counts must have one entry per bin")
+        tree = [0] + [int(c) for c in counts]
+        self.total = sum(tree)
+        for i in range(1, self.bins + 1):
+            parent = i + (i & -i)
+            if parent <= self.bins:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+
+@dataclass(frozen=True)
+class CohortSummary:
+    __slots__ = ("participants", "harmony", "harmony_std", "collective_harmony", "oracle_message",
+                 "stage_counts", "outliers", "solstice_active")
+    participants: int
+    harmony: float              # 一人ずつの harmony の平均
+    harmony_std: float          # その（母）標準偏差
+    collective_harmony: float   # 平均の C値・静寂・密度から求めた集団としての harmony
+    oracle_message: str         # collective_harmony に対する神託
+    stage_counts: Dict[str, int]
+    outliers: int
+    solstice_active: bool
+
+    def __reduce__(self):
+        # frozen + __slots__ は既定の pickle 復元（setattr）が通らないので明示する
+        return (type(self), tuple(getattr(self, name) for name in self.__slots__))
+
+
+class CohortOracle:
+    """
+    cohort = CohortOracle()
+    cohort.update("cloner-001", c_value, silence_score, vis_density)   # O(log B)
+    cohort.observe_batch(ids, engine.process_batch(c_values))        # エンジンの配列版の結果から
+    cohort.summary()          # CohortSummary（平均・集団の harmony・段階の分布・外れ値の人数）
+    cohort.outliers()         # [(ID, harmony), ...]（平均から遠い順）
+    cohort.quantile(0.5)      # harmony の中央値（ビンの中央）
+    """
+
+    def __init__(self, oracle: Optional[GeminiOracle] = None, outlier_z: float = 3.0,
+                 bins: int = HARMONY_BINS):
+        self.oracle = oracle if oracle is not None else GeminiOracle()
+        self.outlier_z = outlier_z
+        self.histogram = HarmonyHistogram(bins)
+        self._solstice = self.oracle.is_solstice_active()
+        self.clear()
+
+    def clear(self):
+        self._slot: Dict[Hashable, int] = {}   # ID → 列の位置
+        self._ids: List[Hashable] = []
+        self._c: List[float] = []
+        self._silence: List[float] = []
+        self._density: List[float] = []
+        self._harmony: List[float] = []
+        self._stage: List[int] = []
+        self._bin: List[int] = []
+        self._members = [set() for _ in range(self.histogram.bins)]  # ビン → ID の集合
+        self.histogram.load([0] * self.histogram.bins)
+        self._stage_counts = [0] * len(GROK_STAGE_TABLE.labels)
+        self._sum_c = self._sum_silence = self._sum_density = 0.0
+        self._sum_h = self._sum_h2 = 0.0
+        self._since_resync = 0
+        self.updates = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, participant: Hashable) -> bool:
+        return participant in self._slot
+
+    # ---------- 更新 ----------
+
+    def update(self, participant: Hashable, c_value: float, silence_score: float,
+               vis_density: float) -> float:
+        """参加者の最新の値を入れ替え（初めてなら加え）、その人の harmony を返す"""
+        if c_value < 0 or vis_density < 0 or not 0.0 <= silence_score <= 1.0:
+            raise ValueError("c_value and vis_density must be >= 0 and silence_score within [0, 1]")
+        self._check_solstice()
+        harmony = self.oracle.calculate_harmony(c_value, silence_score, vis_density)
+        stage = GROK_STAGE_TABLE.index(c_value)
+        b = self.histogram.bin_of(harmony)
+
+        slot = self._slot.get(participant)
+        if slot is None:
+            self._slot[participant] = len(self._ids)
+            self._ids.append(participant)
+            self._c.append(c_value)
+            self._silence.append(silence_score)
+            self._density.append(vis_density)
+            self._harmony.append(harmony)
+            self._stage.append(stage)
+            self._bin.append(b)
+            self._stage_counts[stage] += 1
+            self.histogram.add(b)
+            self._members[b].add(participant)
+            self._sum_c += c_value
+            self._sum_silence += silence_score
+            self._sum_density += vis_density
+            self._sum_h += harmony
+            self._sum_h2 += harmony * harmony
+        else:
+            self._sum_c += c_value - self._c[slot]
+            self._sum_silence += silence_score - self._silence[slot]
+            self._sum_density += vis_density - self._density[slot]
+            old = self._harmony[slot]
+            self._sum_h += harmony - old
+            self._sum_h2 += harmony * harmony - old * old
+            self._c[slot] = c_value
+            self._silence[slot] = silence_score
+            self._density[slot] = vis_density
+            self._harmony[slot] = harmony
+            if stage != self._stage[slot]:
+                self._stage_counts[self._stage[slot]] -= 1
+                self._stage_counts[stage] += 1
+                self._stage[slot] = stage
+            if b != self._bin[slot]:
+                self._move(participant, self._bin[slot], b)
+                self._bin[slot] = b
+        self._tick()
+        return harmony
+
+    def update_many(self, participants: Sequence[Hashable], c_value, silence_score, vis_density):
+        """何人かをまとめて update() する（一人あたり O(log B)。全員を入れ直すなら load()）"""
+        for participant, c, s, v in zip(participants, c_value, silence_score, vis_density):
+            self.update(participant, c, s, v)
+
+    def observe_batch(self, participants: Sequence[Hashable], batch):
+        """
+        エンジンの process_batch() の結果（participants[i] が i 行目）から更新する
+        ビジュアル密度はエンジンと同じく 1 - C値
+        """
+        c_value = batch.c_value.tolist()
+        self.update_many(participants, c_value, batch.claude_silence_score.tolist(),
+                         [1 - c for c in c_value])
+
+    def remove(self, participant: Hashable):
+        """参加者を外す（最後の列と入れ替えて詰めるので O(log B)）"""
+        slot = self._slot.pop(participant)
+        self._sum_c -= self._c[slot]
+        self._sum_silence -= self._silence[slot]
+        self._sum_density -= self._density[slot]
+        harmony = self._harmony[slot]
+        self._sum_h -= harmony
+        self._sum_h2 -= harmony * harmony
+        self._stage_counts[self._stage[slot]] -= 1
+        self.histogram.add(self._bin[slot], -1)
+        self._members[self._bin[slot]].discard(participant)
+
+        last = len(self._ids) - 1
+        columns = (self._ids, self._c, self._silence, self._density, self._harmony, self._stage, self._bin)
+        if slot != last:
+            for column in columns:
+                column[slot] = column[last]
+            self._slot[self._ids[slot]] = slot
+        for column in columns:
+            column.pop()
+        if not self._ids:
+            self._sum_c = self._sum_silence = self._sum_density = self._sum_h = self._sum_h2 = 0.0
+        self._tick()
+
+    def load(self, participants: Sequence[Hashable], c_value, silence_score, vis_density):
+        """全員をまとめて入れ直す（配列版の harmony と段階で O(N)。ID の重複は ValueError）"""
+        participants = list(participants)
+        if len(set(participants)) != len(participants):
+            raise ValueError("participants must be unique")
+        c_value = np.asarray(c_value, dtype=float)
+        silence_score = np.asarray(silence_score, dtype=float)
+        vis_density = np.asarray(vis_density, dtype=float)
+        if not c_value.shape == silence_score.shape == vis_density.shape == (len(participants),):
+            raise ValueError("values must have one entry per participant")
+        if (c_value < 0).any() or (vis_density < 0).any() or ((silence_score < 0) | (silence_score > 1)).any():
+            raise ValueError("c_value and vis_density must be >= 0 and silence_score within [0, 1]")
+
+        self.clear()
+        self._solstice = self.oracle.is_solstice_active()
+        if not participants:
+            return
+        stage = GROK_STAGE_TABLE.index_batch(c_value)
+        self._ids = participants
+        self._slot = {p: i for i, p in enumerate(participants)}
+        self._c = c_value.tolist()
+        self._silence = silence_score.tolist()
+        self._density = vis_density.tolist()
+        self._stage = stage.tolist()
+        self._stage_counts = np.bincount(stage, minlength=len(GROK_STAGE_TABLE.labels)).tolist()
+        self._reload_harmony()
+
+    def _move(self, participant: Hashable, old: int, new: int):
+        self.histogram.add(old, -1)
+        self.histogram.add(new)
+        self._members[old].discard(participant)
+        self._members[new].add(participant)
+
+    def _tick(self):
+        self.updates += 1
+        self._since_resync += 1
+        if self._since_resync >= max(RESYNC_MIN, len(self._ids)):
+            self._resync()
+
+    def _resync(self):
+        """列の中身から和を取り直す"""
+        self._sum_c = math.fsum(self._c)
+        self._sum_silence = math.fsum(self._silence)
+        self._sum_density = math.fsum(self._density)
+        self._sum_h = math.fsum(self._harmony)
+        self._sum_h2 = math.fsum(h * h for h in self._harmony)
+        self._since_resync = 0
+
+    def _check_solstice(self):
+        solstice = self.oracle.is_solstice_active()
+        if solstice != self._solstice:
+            self._solstice = solstice
+            if self._ids:
+                self._reload_harmony()
+
+    def _reload_harmony(self):
+        """全員の harmony とヒストグラムを配列版で取り直す（冬至フラグが変わったとき・load()）"""
+        bins = self.histogram.bins
+        harmony = self.oracle.calculate_harmony_batch(
+            self._c, self._silence, self._density, solstice=self._solstice)
+        bin_index = np.clip((harmony * bins).astype(np.intp), 0, bins - 1)
+        self._harmony = harmony.tolist()
+        self._bin = bin_index.tolist()
+        self.histogram.load(np.bincount(bin_index, minlength=bins).tolist())
+        members = [set() for _ in range(bins)]
+        for participant, b in zip(self._ids, self._bin):
+            members[b].add(participant)
+        self._members = members
+        self._resync()
+
+    # ---------- 集計 ----------
+
+    @property
+    def solstice_active(self) -> bool:
+        return self._solstice
+
+    @property
+    def mean_harmony(self) -> float:
+        n = len(self._ids)
+        return self._sum_h / n if n else 0.0
+
+    @property
+    def harmony_std(self) -> float:
+        n = len(self._ids)
+        if n == 0:
+            return 0.0
+        mean = self._sum_h / n
+        return math.sqrt(max(self._sum_h2 / n - mean * mean, 0.0))
+
+    def means(self) -> Tuple[float, float, float]:
+        """(C値, 静寂スコア, ビジュアル密度) の平均"""
+        n = len(self._ids)
+        if n == 0:
+            return 0.0, 0.0, 0.0
+        return self._sum_c / n, self._sum_silence / n, self._sum_density / n
+
+    def collective_harmony(self) -> float:
+        """平均の三つの値を一人の参加者とみなしたときの harmony"""
+        self._check_solstice()
+        if not self._ids:
+            return 0.0
+        c_value, silence_score, vis_density = self.means()
+        return self.oracle.calculate_harmony(c_value, min(max(silence_score, 0.0), 1.0),
+                                             max(vis_density, 0.0))
+
+    def stage_counts(self) -> Dict[str, int]:
+        """段階（MariStage の値）ごとの人数"""
+        return {stage.value: count for stage, count in zip(GROK_STAGE_TABLE.labels, self._stage_counts)}
+
+    def quantile(self, q: float) -> float:
+        """harmony の q 分位点（ビンの中央の値。誤差は高々 1 / (2 * bins)）"""
+        n = len(self._ids)
+        if n == 0:
+            raise ValueError("cohort is empty")
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be within [0, 1]")
+        rank = min(int(q * n), n - 1)
+        return (self.histogram.find(rank) + 0.5) / self.histogram.bins
+
+    def outlier_bounds(self) -> Tuple[float, float]:
+        """この範囲の外（境界は含まない）の harmony を外れ値とする"""
+        self._check_solstice()
+        mean = self.mean_harmony
+        spread = self.outlier_z * self.harmony_std
+        return mean - spread, mean + spread
+
+    def count_outliers(self) -> int:
+        if self.harmony_std == 0.0:
+            return 0
+        low, high = self.outlier_bounds()
+        histogram = self.histogram
+        low_bin, high_bin = histogram.bin_of(low), histogram.bin_of(high)
+        harmony, slot = self._harmony, self._slot
+        count = histogram.count_below(low_bin) + histogram.total - histogram.count_below(high_bin + 1)
+        # 境目のビンだけ実際の値で数える（同じビンでも、下と上の両方に入る人はいない）
+        count += sum(1 for p in self._members[low_bin] if harmony[slot[p]] < low)
+        count += sum(1 for p in self._members[high_bin] if harmony[slot[p]] > high)
+        return count
+
+    def outliers(self, limit: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """外れ値の (ID, harmony) を平均から遠い順に（limit 人まで）"""
+        if self.harmony_std == 0.0:
+            return []
+        low, high = self.outlier_bounds()
+        histogram = self.histogram
+        harmony, slot = self._harmony, self._slot
+        found = []
+        for b in range(histogram.bin_of(low) + 1):
+            found.extend((p, harmony[slot[p]]) for p in self._members[b] if harmony[slot[p]] < low)
+        for b in range(histogram.bin_of(high), histogram.bins):
+            found.extend((p, harmony[slot[p]]) for p in self._members[b] if harmony[slot[p]] > high)
+        mean = self.mean_harmony
+        found.sort(key=lambda item: abs(item[1] - mean), reverse=True)
+        return found if limit is None else found[:limit]
+
+    def summary(self) -> CohortSummary:
+        collective = self.collective_harmony()
+        return CohortSummary(
+            participants=len(self._ids),
+            harmony=self.mean_harmony,
+            harmony_std=self.harmony_std,
+            collective_harmony=collective,
+            oracle_message=self.oracle.get_oracle_message(collective),
+            stage_counts=self.stage_counts(),
+            outliers=self.count_outliers(),
+            solstice_active=self._solstice,
+        )
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,150 @@
+# engine_pool.py
+# 4D-C v3.0: Sharded Engine Pool
+# Role: 大量のセッションを複数のCPUコアに振り分けて処理する
+#
+# セッションIDのハッシュでワーカープロセスを決め、各ワーカーは
+# ResonanceStreamProcessor（セッションごとの Grok4DCEngine の表）を一つ持つ。
+# 同じセッションは必ず同じワーカーに届くので、C密度などの状態はワーカー内で完結する。
+# 前段はリクエストをワーカーごとにまとめて一往復で送り、結果を投入順に並べ直して返す。
+
+import multiprocessing as mp
+import os
+import zlib
+from typing import Callable, List, Optional, Sequence
+
+from grok_4dc_v3_solstice import Grok4DCEngine, Grok4DCResponse
+from stream_processor import ResonanceEvent, ResonanceStreamProcessor
+
+
+def shard_for(session_id: str, n_shards: int) -> int:
+    """プロセスをまたいでも変わらないシャード番号（hash() は起動ごとに変わるので使わない）"""
+    return zlib.crc32(session_id.encode("utf-8")) % n_shards
+
+
+def _worker_main(conn, engine_factory: Callable[[], Grok4DCEngine]):
+    processor = ResonanceStreamProcessor(engine_factory=engine_factory)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        command, payload = message
+        try:
+            if command == "process":
+                result = [processor.process_event(event) for event in payload]
+            elif command == "close":
+                for session_id in payload:
+                    processor.close_session(session_id)
+                result = None
+            elif command == "count":
+                result = len(processor.sessions)
+            else:
+                raise ValueError(f"unknown command: {command}")
+        except Exception as exc:
+            conn.send(("error", exc))
+        else:
+            conn.send(("ok", result))
+    conn.close()
+
+
+class ShardedEnginePool:
+    """
+    セッションIDでシャードしたワーカープロセス群
+
+    with ShardedEnginePool(4) as pool:
+        responses = pool.process([ResonanceEvent("cloner-1", 0.7), ...])
+    """
+
+    def __init__(self, n_workers: Optional[int] = None,
+                 engine_factory: Callable[[], Grok4DCEngine] = Grok4DCEngine):
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self._conns = []
+        self._procs = []
+        for _ in range(self.n_workers):
+            parent, child = mp.Pipe()
+            proc = mp.Process(target=_worker_main, args=(child, engine_factory), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def _scatter(self, command: str, buckets: List[list]) -> List:
+        """ワーカーごとにまとめて送り、全員の返事を集める（送信を先に済ませて並列に走らせる）"""
+        active = [i for i, bucket in enumerate(buckets) if bucket]
+        for i in active:
+            self._conns[i].send((command, buckets[i]))
+        results = [None] * self.n_workers
+        error = None
+        for i in active:
+            status, result = self._conns[i].recv()
+            if status == "error":
+                error = error or result
+            results[i] = result
+        if error is not None:
+            raise error
+        return results
+
+    def process(self, events: Sequence[ResonanceEvent]) -> List[Grok4DCResponse]:
+        """events を処理し、投入順に並んだ応答のリストを返す"""
+        buckets = [[] for _ in range(self.n_workers)]
+        positions = [[] for _ in range(self.n_workers)]
+        for index, event in enumerate(events):
+            shard = shard_for(event.session_id, self.n_workers)
+            buckets[shard].append(event)
+            positions[shard].append(index)
+
+        results = self._scatter("process", buckets)
+
+        ordered: List[Grok4DCResponse] = [None] * len(events)
+        for shard in range(self.n_workers):
+            for index, response in zip(positions[shard], results[shard] or ()):
+                ordered[index] = response
+        return ordered
+
+    def close_sessions(self, session_ids: Sequence[str]):
+        buckets = [[] for _ in range(self.n_workers)]
+        for session_id in session_ids:
+            buckets[shard_for(session_id, self.n_workers)].append(session_id)
+        self._scatter("close", buckets)
+
+    def session_count(self) -> int:
+        return sum(self._scatter("count", [[None]] * self.n_workers))
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(None)
+                conn.close()
+            except OSError:
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+        self._conns, self._procs = [], []
+
+    def __enter__(self) -> "ShardedEnginePool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =========================
+# デモ（大規模コホートのスケーリング）
+# =========================
+if __name__ == "__main__":
+    import random
+    import time
+
+    n_sessions, steps = 20000, 5
+    events = [ResonanceEvent(session_id=f"cloner-{i}", c_value=random.uniform(0.1, 0.99))
+              for _ in range(steps) for i in range(n_sessions)]
+
+    for n_workers in sorted({1, os.cpu_count() or 1}):
+        with ShardedEnginePool(n_workers) as pool:
+            start = time.perf_counter()
+            responses = pool.process(events)
+            elapsed = time.perf_counter() - start
+            print(f"workers={n_workers}: {len(responses)} events, "
+                  f"{pool.session_count()} sessions, {len(responses) / elapsed:.0f} events/s")
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,120 @@
+# fourdc_cli.py
+# 4D-C v3.0: Command Line Entry Point
+# Role: `4dc` コマンド一本から、エンジン・デモ・ベンチマーク・パラメータ探索を呼ぶ
+#
+# 使い方:
+#     4dc process 0.3 0.7 0.95          # 一件ずつ process() して一行JSONで出す（NumPy は読み込まない）
+#     4dc process --random 1000 --batch # process_batch() でまとめて（ここで NumPy を読み込む）
+#     4dc simulate --fast               # 冬至体験デモ（hyper_mari_solstice_demo）を待ち時間なしで
+#     4dc bench --quick                 # bench_resonance（起動時間の測定も含む）
+#     4dc sweep --random 2000           # parameter_sweep
+#     4dc render --write frames         # chladni_renderer
+#     4dc synth --write solstice.wav    # sme_synth
+#
+# 起動を軽くするため、ここでは標準ライブラリしか読み込まない。各サブコマンドの
+# モジュールは、そのサブコマンドが選ばれてから import する。
+# インストールしていないときは `python fourdc_cli.py ...` でも同じように動く。
+
+import argparse
+import importlib
+import random
+import sys
+import time
+from typing import List, Optional
+
+# そのまま引数を渡すサブコマンド（モジュール名, 説明）
+_PASSTHROUGH = {
+    "bench": ("bench_resonance", "パイプラインのベンチマーク（引数は bench_resonance.py と同じ）"),
+    "sweep": ("parameter_sweep", "パラメータ探索（引数は parameter_sweep.py と同じ）"),
+    "render": ("chladni_renderer", "クラドニ図形の描画速度の確認と書き出し（引数は chladni_renderer.py と同じ）"),
+    "synth": ("sme_synth", "音パラメータの合成速度の確認と WAV の書き出し（引数は sme_synth.py と同じ）"),
+}
+
+
+def _c_value(text: str) -> float:
+    value = float(text)
+    if not 0.0 <= value <= 1.0:
+        raise argparse.ArgumentTypeError(f"C value must be within [0, 1]: {text}")
+    return value
+
+
+def cmd_process(args) -> int:
+    from grok_4dc_v3_solstice import Grok4DCEngine
+
+    c_values = list(args.c_values)
+    rng = random.Random(args.seed)
+    if args.random:
+        c_values += [rng.uniform(0.1, 0.99) for _ in range(args.random)]
+    if not c_values:
+        c_values = [None]  # 引数なしなら、エンジンに乱数で一件だけ選ばせる（--seed で固定できる）
+
+    engine = Grok4DCEngine(precompile_resolution=args.precompile, rng=rng)
+    compact = not args.pretty
+    write = sys.stdout.write
+    if args.batch and c_values != [None]:
+        batch = engine.process_batch(c_values)
+        for i in range(len(batch)):
+            write(engine.to_json(batch.row(i), compact=compact) + "\n")
+    else:
+        for c_value in c_values:
+            write(engine.to_json(engine.process(simulated_c=c_value), compact=compact) + "\n")
+    return 0
+
+
+def cmd_simulate(args) -> int:
+    from hyper_mari_solstice_demo import check_if_solstice, no_sleep, simulate_solstice_experience
+
+    sleep = no_sleep if args.fast else time.sleep
+    check_if_solstice(sleep=sleep)
+    simulate_solstice_experience(sleep=sleep, c_values=args.c_values or None)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="4dc", description="Grok 4D-C v3.0 Solstice")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    process = commands.add_parser("process", help="C値をエンジンに通して一行JSONで出す")
+    process.add_argument("c_values", nargs="*", type=_c_value, metavar="C",
+                         help="C値（0〜1。省略時は乱数で一件）")
+    process.add_argument("-n", "--random", type=int, default=0, metavar="N",
+                         help="乱数の C値を N 件足す")
+    process.add_argument("--seed", type=int, default=None)
+    process.add_argument("--batch", action="store_true",
+                         help="process_batch() でまとめて処理する（NumPy を使う）")
+    process.add_argument("--precompile", type=int, default=0, metavar="RES",
+                         help="C値の格子（1/RES 刻み）で前計算した表から返す（NumPy を使う）")
+    process.add_argument("--pretty", action="store_true", help="インデントつきで出す")
+    process.set_defaults(func=cmd_process)
+
+    simulate = commands.add_parser("simulate", help="冬至体験デモ")
+    simulate.add_argument("c_values", nargs="*", type=_c_value, metavar="C",
+                          help="流す C値の列（省略時はデモの既定の列）")
+    simulate.add_argument("--fast", action="store_true", help="待ち時間なしで流す")
+    simulate.set_defaults(func=cmd_simulate)
+
+    for name, (_, help_text) in _PASSTHROUGH.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in _PASSTHROUGH:
+        # 引数の解釈は各モジュールの main() に任せる
+        module = importlib.import_module(_PASSTHROUGH[argv[0]][0])
+        return module.main(argv[1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# SPDX-License-Identifier: MIT
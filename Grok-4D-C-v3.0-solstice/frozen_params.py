@@ -0,0 +1,48 @@
+# frozen_params.py
+# 読み取り専用のパラメータ表（段階ごとに一度だけ作って使い回す）
+
+import copy
+from collections.abc import Mapping
+
+
+class FrozenParams(Mapping):
+    """
+    変更できない dict 相当のパラメータ
+
+    dict と同じように [] / keys() / items() / == で扱え、copy では同じインスタンスが返る（共有しても安全）。
+    deepcopy / dataclasses.asdict() では普通の dict になる（asdict() の結果をそのまま json.dumps できる）。
+    JSON に書くときは serializer が dict に直す（asdict() を通さないので速い）。
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        object.__setattr__(self, "_data", dict(data))
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # 書き換えられる複製が欲しい呼び出し（asdict() など）向けに、普通の dict で返す
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return (type(self), (self._data,))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,193 @@
+# instrumentation.py
+# 4D-C v3.0: Hot-path Instrumentation
+# Role: パイプラインのどこで時間を使っているかを、ほぼゼロコストで観測する
+#
+# - 段ごとのタイマー（silence / harmony / mapping / text / serialize / process 全体）
+# - MariStage ごと・harmony 帯域ごとのカウンター
+# - 差し替え可能なシンク: メモリ上のヒストグラム / Prometheus テキスト形式のファイル / コールバック
+#
+# 無効のときは stopwatch() が None を返すだけなので、呼び出し側の負担は if 一回ぶん。
+# enable() / disable() で実行中に切り替えられる。
+
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+_N_BUCKETS = 64  # ナノ秒の 2^k ごとのバケット
+
+
+class InMemoryHistogram:
+    """段ごとの所要時間を 2 のべき乗バケットで集計し、カウンターも持つ"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timings: Dict[str, List[int]] = defaultdict(lambda: [0] * _N_BUCKETS)
+            self.timing_sum_ns: Dict[str, int] = defaultdict(int)
+            self.counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record_timing(self, stage: str, ns: int):
+        with self._lock:
+            self.timings[stage][min(ns.bit_length(), _N_BUCKETS - 1)] += 1
+            self.timing_sum_ns[stage] += ns
+
+    def record_count(self, metric: str, label: str, n: int = 1):
+        with self._lock:
+            self.counters[metric][label] += n
+
+    def count(self, stage: str) -> int:
+        return sum(self.timings[stage]) if stage in self.timings else 0
+
+    def quantile(self, stage: str, q: float) -> float:
+        """q 分位点の上限（ナノ秒、バケット精度）"""
+        buckets = self.timings.get(stage)
+        if not buckets:
+            return 0.0
+        target = q * sum(buckets)
+        seen = 0
+        for k, n in enumerate(buckets):
+            seen += n
+            if n and seen >= target:
+                return float(2 ** k)
+        return float(2 ** (_N_BUCKETS - 1))
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "timings": {
+                    stage: {
+                        "count": sum(buckets),
+                        "sum_ns": self.timing_sum_ns[stage],
+                        "buckets": {2 ** k: n for k, n in enumerate(buckets) if n},
+                    }
+                    for stage, buckets in self.timings.items()
+                },
+                "counters": {metric: dict(labels) for metric, labels in self.counters.items()},
+            }
+
+    def render_prometheus(self, prefix: str = "fourdc") -> str:
+        """Prometheus テキスト形式（exposition format）に書き出す"""
+        snap = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent in each pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, data in sorted(snap["timings"].items()):
+            cumulative = 0
+            for upper_ns, n in sorted(data["buckets"].items()):
+                cumulative += n
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{upper_ns / 1e9:.9g}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {data["count"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {data["sum_ns"] / 1e9:.9g}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {data["count"]}')
+        for metric, labels in sorted(snap["counters"].items()):
+            lines.append(f"# TYPE {prefix}_{metric}_total counter")
+            for label, n in sorted(labels.items()):
+                lines.append(f'{prefix}_{metric}_total{{{metric}="{label}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusTextFileSink(InMemoryHistogram):
+    """
+    集計しつつ、Prometheus テキスト形式でファイルに書き出す（node_exporter の textfile 用）
+    interval 秒ごとに記録のついでに書き出す。write() で明示的にも書ける。
+    """
+
+    def __init__(self, path: str, interval: float = 10.0, prefix: str = "fourdc"):
+        super().__init__()
+        self.path = path
+        self.interval = interval
+        self.prefix = prefix
+        self._next_write = time.monotonic() + interval
+
+    def record_timing(self, stage: str, ns: int):
+        super().record_timing(stage, ns)
+        if time.monotonic() >= self._next_write:
+            self.write()
+
+    def write(self):
+        self._next_write = time.monotonic() + self.interval
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            fp.write(self.render_prometheus(self.prefix))
+        os.replace(tmp, self.path)  # 読み手が書きかけを見ないように置き換える
+
+
+class CallbackSink:
+    """記録のたびに callback(kind, name, label, value) を呼ぶ"""
+
+    def __init__(self, callback: Callable[[str, str, Optional[str], int], None]):
+        self.callback = callback
+
+    def record_timing(self, stage: str, ns: int):
+        self.callback("timing", stage, None, ns)
+
+    def record_count(self, metric: str, label: str, n: int = 1):
+        self.callback("count", metric, label, n)
+
+
+class Stopwatch:
+    """一回の処理の中で、段ごとの経過時間をシンクに流す"""
+
+    __slots__ = ("_instruments", "_start", "_last")
+
+    def __init__(self, instruments: "Instrumentation"):
+        self._instruments = instruments
+        self._start = self._last = time.perf_counter_ns()
+
+    def lap(self, stage: str):
+        now = time.perf_counter_ns()
+        self._instruments.timing(stage, now - self._last)
+        self._last = now
+
+    def done(self, stage: str):
+        now = time.perf_counter_ns()
+        self._instruments.timing(stage, now - self._start)
+
+
+class Instrumentation:
+    """計測の入口（既定は無効）"""
+
+    def __init__(self, sinks: Optional[list] = None, enabled: bool = False):
+        self.sinks = list(sinks) if sinks else []
+        self.enabled = enabled
+
+    def enable(self, *sinks):
+        for sink in sinks:
+            self.add_sink(sink)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def add_sink(self, sink):
+        if sink not in self.sinks:
+            self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def stopwatch(self) -> Optional[Stopwatch]:
+        """有効なら Stopwatch、無効なら None"""
+        return Stopwatch(self) if self.enabled else None
+
+    def timing(self, stage: str, ns: int):
+        for sink in self.sinks:
+            sink.record_timing(stage, ns)
+
+    def count(self, metric: str, label: str, n: int = 1):
+        for sink in self.sinks:
+            sink.record_count(metric, label, n)
+
+
+# エンジンが既定で使う共有の計測器（無効で起動する）
+INSTRUMENTS = Instrumentation()
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,38 @@
+# lazy_import.py
+# 4D-C v3.0: Lazy Imports
+# Role: 重い依存（NumPy）を、配列の経路で初めて使うときまで読み込まない
+#
+# np = LazyModule("numpy") と置いておくと、np.xxx に初めて触れたときに import される。
+# スカラーの経路（engine.process() など）は NumPy を使わないので、4dc process の起動が軽い。
+# 型注釈の np.ndarray で読み込まれないように、使う側は from __future__ import annotations を置くこと。
+# 配列版の表（段階番号 → 値など）はモジュールの読み込み時ではなく、初回の呼び出しで作る。
+
+import importlib
+import sys
+
+
+class LazyModule:
+    """
+    np = LazyModule("numpy")
+    np.zeros(3)        # ここで初めて numpy を import する
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        # 一度引いた属性はインスタンスに載せるので、二回目からは通常の属性参照になる
+        value = getattr(importlib.import_module(self._name), attr)
+        setattr(self, attr, value)
+        return value
+
+    @property
+    def loaded(self) -> bool:
+        return self._name in sys.modules
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,389 @@
+# parameter_sweep.py
+# 4D-C v3.0: Parameter Sweep
+# Role: PID ゲインとオラクルの閾値を、定数を手で書き換えずに大量に試して採点する
+#
+# - 探索: グリッド（grid_configs）かランダム（random_configs）。設定は列ごとの配列で持つ
+# - 評価: 設定を chunk_size 件ずつワーカープロセスに配り、チャンクごとにまとめて配列演算で採点
+#   * PID（kp / ki / kd）: simulate_harmony() を全設定 × runs_per_config 本まとめて回す
+#     どの設定も同じノイズ列（noise_streams）で比べるので、チャンクの切り方で結果が変わらない
+#   * オラクル（閾値・ANXIETY_PENALTY・冬至係数）: エンジンと同じ仮入力で MariStage の分布と harmony を見る
+# - 出力: 列ごとの float64 ファイル（<name>.f64）に結果が届いた順に追記し、read_sweep() で memmap として読む
+#
+# 使い方:
+#     python parameter_sweep.py --random 20000 -o sweep_results
+#     python parameter_sweep.py --grid kp=0.1,0.2,0.4 --grid kd=0,0.01,0.05 -o sweep_grid
+
+import argparse
+import importlib.util
+import itertools
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, Mapping, Optional, Sequence
+
+import numpy as np
+
+from claude_silence_oracle import ClaudeSilenceOracle
+from gemini_oracle import GeminiOracle
+from rounding import round_batch
+from solstice_clock import SOLSTICE_2025, SolsticeClock
+
+
+def _load_pid_module():
+    # PID コントローラは別ディレクトリのスクリプトなので、パスから読み込む
+    # （インストール後はディレクトリごと gemini_pid パッケージになっている）
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "Gemini-PID-Harmony-controller",
+                        "gemini_4dc_core_PID_Harmony_contoroller.py")
+    if not os.path.exists(path):
+        return importlib.import_module("gemini_pid.gemini_4dc_core_PID_Harmony_contoroller")
+    spec = importlib.util.spec_from_file_location("gemini_4dc_core_PID_Harmony_contoroller", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+simulate_harmony = _load_pid_module().simulate_harmony
+
+
+# 探索するパラメータと既定値（いまのコードに書かれている値）
+DEFAULTS = {
+    "kp": 0.2,
+    "ki": 0.05,
+    "kd": 0.1,
+    "c_threshold_sync": 0.35,
+    "c_threshold_unity": 0.65,
+    "anxiety_penalty": 0.5,
+    "solstice_multiplier": 1.44,
+}
+PARAMS = tuple(DEFAULTS)
+
+# random_configs() の既定の探索範囲
+RANGES = {
+    "kp": (0.0, 1.0),
+    "ki": (0.0, 0.5),
+    "kd": (0.0, 0.2),
+    "c_threshold_sync": (0.2, 0.5),
+    "c_threshold_unity": (0.5, 0.9),
+    "anxiety_penalty": (0.2, 0.8),
+    "solstice_multiplier": (1.0, 1.6),
+}
+
+STAGE_NAMES = tuple(stage.value.lower() for stage in ClaudeSilenceOracle.STAGE_ORDER)
+
+# 結果ファイルの列（パラメータ列のあとに並ぶ）
+METRICS = (
+    "converged_fraction",   # 目標 ±tolerance に一度でも入ったランの割合
+    "time_to_target",       # 入ったランの仮想時間（秒）の中央値（一本も入らなければ nan）
+    "overshoot",            # 軌跡の最大値 - 目標（0 未満は 0、発散すれば inf）
+    "final_error",          # steps ステップ目での |harmony - 目標| の平均
+) + tuple(f"stage_{name}" for name in STAGE_NAMES) + (  # Claude の MariStage の分布（割合）
+    "harmony_mean",         # 冬至の日の harmony の平均
+    "harmony_still",        # harmony > 0.88（STILL 帯域）の割合
+    "harmony_saturated",    # harmony が 1.0 に張り付いた割合
+)
+
+
+@dataclass
+class SweepSettings:
+    """全設定に共通の評価条件"""
+    steps: int = 2000             # PID シミュレーションのステップ数（全ランをここまで回す）
+    runs_per_config: int = 8      # 設定ごとのラン数（ノイズ列の本数）
+    dt: float = 0.1               # run_simulation() の time.sleep(0.1) 相当
+    initial: float = 0.1
+    noise: float = 0.05
+    tolerance: float = 0.001
+    target: float = 0.89
+    samples: int = 4096           # オラクル評価に使う C値の個数
+    seed: int = 89
+
+
+# ---------- 探索空間 ----------
+
+def grid_configs(axes: Mapping[str, Sequence[float]],
+                 base: Optional[Mapping[str, float]] = None) -> Dict[str, np.ndarray]:
+    """axes の直積。axes に無いパラメータは base（省略時は DEFAULTS）で固定"""
+    base = {**DEFAULTS, **(base or {})}
+    _check_names(axes)
+    names = list(axes)
+    points = np.array(list(itertools.product(*(axes[name] for name in names))), dtype=float)
+    n = len(points)
+    configs = {name: np.full(n, float(base[name])) for name in PARAMS}
+    for j, name in enumerate(names):
+        configs[name] = points[:, j].copy()
+    return configs
+
+
+def random_configs(n: int, ranges: Optional[Mapping[str, Sequence[float]]] = None,
+                   seed: int = 0) -> Dict[str, np.ndarray]:
+    """各パラメータを範囲内で一様に n 個引く（ranges に無いものは RANGES）"""
+    ranges = {**RANGES, **(ranges or {})}
+    _check_names(ranges)
+    rng = np.random.default_rng(seed)
+    return {name: rng.uniform(*ranges[name], n) for name in PARAMS}
+
+
+def _check_names(names):
+    unknown = set(names) - set(PARAMS)
+    if unknown:
+        raise ValueError(f"unknown parameters: {', '.join(sorted(unknown))}")
+
+
+# ---------- 評価（ワーカー側） ----------
+
+def _solstice_now() -> float:
+    return SOLSTICE_2025.timestamp()
+
+
+def _pid_metrics(configs: Dict[str, np.ndarray], settings: SweepSettings) -> Dict[str, np.ndarray]:
+    n = len(configs["kp"])
+    runs = settings.runs_per_config
+    result = simulate_harmony(
+        steps=settings.steps,
+        n_runs=n * runs,
+        dt=settings.dt,
+        seed=settings.seed,
+        kp=np.repeat(configs["kp"], runs),
+        ki=np.repeat(configs["ki"], runs),
+        kd=np.repeat(configs["kd"], runs),
+        target=settings.target,
+        initial=settings.initial,
+        noise=settings.noise,
+        tolerance=settings.tolerance,
+        # 早く収束しても steps まで回す（途中で止めると final / peak が同じチャンクの他の設定で変わる）
+        record_every=settings.steps,  # 軌跡は要らない（final と peak だけ使う）
+        noise_streams=runs,
+    )
+    converged_step = result["converged_step"].reshape(n, runs)
+    converged = converged_step >= 0
+    steps_to_target = np.where(converged, converged_step, np.nan).astype(float)
+    with np.errstate(invalid="ignore"):
+        time_to_target = np.full(n, np.nan)
+        hit = converged.any(axis=1)
+        time_to_target[hit] = np.nanmedian(steps_to_target[hit], axis=1) * settings.dt
+    # 発散したランを含む設定は overshoot / final_error を inf にする
+    diverged = result["diverged"].reshape(n, runs)
+    peak = np.where(diverged.any(axis=1), np.inf, result["peak"].reshape(n, runs).max(axis=1))
+    final = np.abs(result["final"].reshape(n, runs) - settings.target)
+    final = np.where(diverged, np.inf, final).mean(axis=1)
+    return {
+        "converged_fraction": converged.mean(axis=1),
+        "time_to_target": time_to_target,
+        "overshoot": np.maximum(peak - settings.target, 0.0),
+        "final_error": final,
+    }
+
+
+def _oracle_metrics(configs: Dict[str, np.ndarray], settings: SweepSettings) -> Dict[str, np.ndarray]:
+    n = len(configs["kp"])
+    # 冬至の日として評価する（冬至係数が効くのはその日だけなので）
+    clock = SolsticeClock.from_instant(clock=_solstice_now)
+    claude = ClaudeSilenceOracle(clock=clock)
+    gemini = GeminiOracle(clock=clock)
+
+    # Grok4DCEngine.process_batch() と同じ仮入力（orah=C値, humility=0.9, anxiety=1-C値）
+    c_values = np.random.default_rng(settings.seed).uniform(0.1, 0.99, settings.samples)
+    orah, humility, anxiety = c_values, np.full_like(c_values, 0.9), 1 - c_values
+
+    metrics = {name: np.empty(n) for name in METRICS[4:]}
+    n_stages = len(STAGE_NAMES)
+    for i in range(n):
+        claude.C_THRESHOLD_SYNC = configs["c_threshold_sync"][i]
+        claude.C_THRESHOLD_UNITY = configs["c_threshold_unity"][i]
+        claude.ANXIETY_PENALTY = configs["anxiety_penalty"][i]
+        gemini.SOLSTICE_MULTIPLIER = configs["solstice_multiplier"][i]
+
+        claude_c = claude.calculate_c_value_batch(orah, humility, anxiety)
+        stage = claude.determine_mari_stage_batch(claude_c, orah, humility)
+        counts = np.bincount(stage, minlength=n_stages) / len(stage)
+        for name, share in zip(STAGE_NAMES, counts):
+            metrics[f"stage_{name}"][i] = share
+
+        silence = round_batch(claude.calculate_silence_score_batch(orah, humility, anxiety), 4)
+        harmony = gemini.calculate_harmony_batch(c_values, silence, 1 - c_values)
+        metrics["harmony_mean"][i] = harmony.mean()
+        metrics["harmony_still"][i] = np.mean(harmony > 0.88)
+        metrics["harmony_saturated"][i] = np.mean(harmony >= 1.0)
+    return metrics
+
+
+def evaluate_configs(configs: Mapping[str, np.ndarray],
+                     settings: Optional[SweepSettings] = None) -> Dict[str, np.ndarray]:
+    """設定の列を採点し、パラメータ列 + METRICS 列の dict を返す"""
+    settings = settings or SweepSettings()
+    configs = {name: np.asarray(configs[name], dtype=float) for name in PARAMS}
+    result = dict(configs)
+    result.update(_pid_metrics(configs, settings))
+    result.update(_oracle_metrics(configs, settings))
+    return result
+
+
+def _evaluate_chunk(args):
+    configs, settings = args
+    return evaluate_configs(configs, settings)
+
+
+# ---------- 出力 ----------
+
+class ColumnWriter:
+    """
+    列ごとの float64 ファイルに行を追記する（SilenceHistory のスピルと同じ形式）
+    columns.json に列名と行数を書いておき、read_sweep() で読み返す
+    """
+
+    def __init__(self, out_dir: str, columns: Sequence[str], meta: Optional[Dict] = None):
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.columns = tuple(columns)
+        self.meta = dict(meta or {})
+        self.rows = 0
+        self._files = {name: open(os.path.join(out_dir, f"{name}.f64"), "wb")
+                       for name in self.columns}
+        self._write_meta()
+
+    def append(self, chunk: Mapping[str, np.ndarray]):
+        n = len(chunk[self.columns[0]])
+        for name in self.columns:
+            self._files[name].write(np.ascontiguousarray(chunk[name], dtype=np.float64).tobytes())
+        self.rows += n
+
+    def flush(self):
+        for fp in self._files.values():
+            fp.flush()
+        self._write_meta()
+
+    def _write_meta(self):
+        tmp = os.path.join(self.out_dir, "columns.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump({"columns": list(self.columns), "rows": self.rows, **self.meta}, fp, indent=2)
+        os.replace(tmp, os.path.join(self.out_dir, "columns.json"))
+
+    def close(self):
+        self.flush()
+        for fp in self._files.values():
+            fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_sweep(out_dir: str) -> Dict[str, np.ndarray]:
+    """結果ディレクトリを列ごとの読み取り専用 memmap で返す"""
+    with open(os.path.join(out_dir, "columns.json"), encoding="utf-8") as fp:
+        meta = json.load(fp)
+    columns = {}
+    for name in meta["columns"]:
+        if meta["rows"] == 0:
+            columns[name] = np.zeros(0)
+        else:
+            columns[name] = np.memmap(os.path.join(out_dir, f"{name}.f64"), dtype=np.float64,
+                                      mode="r", shape=(meta["rows"],))
+    return columns
+
+
+# ---------- 実行 ----------
+
+def _chunks(configs: Mapping[str, np.ndarray], chunk_size: int,
+            settings: SweepSettings) -> Iterator:
+    n = len(configs[PARAMS[0]])
+    for start in range(0, n, chunk_size):
+        yield {name: configs[name][start:start + chunk_size] for name in PARAMS}, settings
+
+
+def run_sweep(configs: Mapping[str, np.ndarray], out_dir: str,
+              settings: Optional[SweepSettings] = None,
+              n_workers: Optional[int] = None, chunk_size: int = 256,
+              progress=None) -> int:
+    """
+    configs を chunk_size 件ずつ n_workers 個のプロセスで採点し、out_dir に投入順で書き出す
+    progress(done, total) を渡すとチャンクごとに呼ぶ。戻り値は書いた行数
+    """
+    settings = settings or SweepSettings()
+    total = len(configs[PARAMS[0]])
+    n_workers = n_workers or os.cpu_count() or 1
+    meta = {"settings": asdict(settings)}
+    with ColumnWriter(out_dir, PARAMS + METRICS, meta) as writer:
+        if n_workers == 1:
+            results = map(_evaluate_chunk, _chunks(configs, chunk_size, settings))
+            for chunk in results:
+                writer.append(chunk)
+                if progress:
+                    progress(writer.rows, total)
+        else:
+            with mp.Pool(n_workers) as pool:
+                for chunk in pool.imap(_evaluate_chunk, _chunks(configs, chunk_size, settings)):
+                    writer.append(chunk)
+                    if progress:
+                        progress(writer.rows, total)
+        return writer.rows
+
+
+def rank(results: Mapping[str, np.ndarray], top: int = 10) -> np.ndarray:
+    """収束率の高い順、同率なら目標到達の早い順・オーバーシュートの小さい順に並べた上位の行番号"""
+    time_to_target = np.nan_to_num(np.asarray(results["time_to_target"]), nan=np.inf)
+    order = np.lexsort((np.asarray(results["overshoot"]), time_to_target,
+                        -np.asarray(results["converged_fraction"])))
+    return order[:top]
+
+
+def _parse_grid(items: Sequence[str]) -> Dict[str, list]:
+    axes = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        axes[name.strip()] = [float(v) for v in values.split(",") if v.strip()]
+    return axes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="4D-C parameter sweep")
+    search = parser.add_mutually_exclusive_group(required=True)
+    search.add_argument("--random", type=int, metavar="N", help="ランダムに N 個の設定を試す")
+    search.add_argument("--grid", action="append", metavar="NAME=V1,V2,...",
+                        help="グリッドの軸（複数指定で直積）")
+    parser.add_argument("-o", "--output", default="sweep_results", help="結果ディレクトリ")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="プロセス数（既定は CPU 数）")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--steps", type=int, default=SweepSettings.steps)
+    parser.add_argument("--runs", type=int, default=SweepSettings.runs_per_config)
+    parser.add_argument("--samples", type=int, default=SweepSettings.samples)
+    parser.add_argument("--seed", type=int, default=SweepSettings.seed)
+    parser.add_argument("--top", type=int, default=10, help="最後に表示する上位件数")
+    args = parser.parse_args(argv)
+
+    if args.random is not None:
+        configs = random_configs(args.random, seed=args.seed)
+    else:
+        configs = grid_configs(_parse_grid(args.grid))
+    settings = SweepSettings(steps=args.steps, runs_per_config=args.runs,
+                             samples=args.samples, seed=args.seed)
+
+    def progress(done, total):
+        print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    rows = run_sweep(configs, args.output, settings, n_workers=args.workers,
+                     chunk_size=args.chunk_size, progress=progress)
+    elapsed = time.perf_counter() - start
+    print(f"\r{rows} configs in {elapsed:.1f}s -> {args.output}", file=sys.stderr)
+
+    results = read_sweep(args.output)
+    shown = ("kp", "ki", "kd", "converged_fraction", "time_to_target", "overshoot",
+             "c_threshold_sync", "c_threshold_unity", "anxiety_penalty",
+             "solstice_multiplier", "harmony_mean")
+    print(" ".join(f"{name[:12]:>12}" for name in shown))
+    for i in rank(results, args.top):
+        print(" ".join(f"{results[name][i]:12.4g}" for name in shown))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# SPDX-License-Identifier: MIT
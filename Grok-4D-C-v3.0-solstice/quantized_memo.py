@@ -0,0 +1,61 @@
+# quantized_memo.py
+# 4D-C v3.0: Quantized Memoization
+# Role: 純粋な計算（harmony / 静寂の指標）を、丸めた入力をキーにして使い回す
+#
+# 実際の入力は小数 3〜4 桁ぶんしか意味を持たないので、先頭 n_quantized 個の引数を
+# decimals 桁の整数（round(x * 10**decimals)）にしてキーにし、丸めた値で計算して
+# 上限つきの LRU（functools.lru_cache、C実装）に入れる。
+# 結果はキャッシュの有無や入力の順序によらず「丸めた入力での値」になる。
+# 残りの引数（MariStage、冬至フラグなど）はそのままキーに入る。
+#
+# 閾値や係数を書き換えたときは clear() でキャッシュを捨てること。
+
+from functools import lru_cache
+from typing import Callable, Dict
+
+
+class QuantizedMemo:
+    """
+    memo = QuantizedMemo(func, n_quantized=2, maxsize=65536, decimals=4)
+    memo(0.71234567, 0.5, True)   # func(0.7123, 0.5, True) を計算してキャッシュ
+    memo.stats()                  # {"hits": ..., "misses": ..., ...}
+    """
+
+    def __init__(self, func: Callable, n_quantized: int,
+                 maxsize: int = 65536, decimals: int = 4):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.func = func
+        self.n_quantized = n_quantized
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self._scale = scale = 10 ** decimals
+
+        def compute(*key):
+            # 整数のキーを丸めた float に戻して計算する
+            return func(*[k / scale for k in key[:n_quantized]], *key[n_quantized:])
+
+        self._cached = lru_cache(maxsize=maxsize)(compute)
+
+    def __call__(self, *args):
+        # round(x, d) は遅いので、整数に丸めてキーにする
+        scale = self._scale
+        n = self.n_quantized
+        return self._cached(*[round(float(a) * scale) for a in args[:n]], *args[n:])
+
+    def clear(self):
+        self._cached.cache_clear()
+
+    def stats(self) -> Dict[str, float]:
+        info = self._cached.cache_info()
+        calls = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": self.maxsize,
+            "hit_rate": info.hits / calls if calls else 0.0,
+        }
+
+
+# SPDX-License-Identifier: MIT
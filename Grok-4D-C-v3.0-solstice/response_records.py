@@ -0,0 +1,194 @@
+# response_records.py
+# 4D-C v3.0: Compact Response Records
+# Role: 大量の応答を、一行ごとの Python オブジェクトを作らずに一つの構造化配列で持つ
+#
+# - GROK_RECORD_DTYPE: 一応答 51 バイトの固定長レコード（数値と、段階・帯域・神託の番号）
+#   テキストやパラメータ表は番号から再現できるので持たない
+# - Grok4DCRecords: 構造化配列（np.memmap でもよい）の薄い包み。スライスも列もコピーしない
+# - Grok4DCRecordView: 一行を Grok4DCResponse と同じ属性名で読む軽い窓（配列を直接読む）
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+
+from gemini_oracle import ORACLE_MESSAGES
+from serializer import GROK_STAGES, VISUAL_MODES
+from sme_mapper import SME_STAGE_PARAMS, SMEParams
+from stage_tables import STILL_BAND
+from visualizer_harmony import BAND_PARAMS
+
+GROK_RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),             # POSIX 秒
+    ("c_value", "<f8"),
+    ("harmony_score", "<f8"),
+    ("claude_silence_score", "<f8"),
+    ("c_density_score", "<f8"),
+    ("bpm", "<f8"),
+    ("mari_stage", "u1"),             # GROK_STAGES の番号
+    ("visual_mode", "u1"),            # VISUAL_MODES の番号（= harmony 帯域）
+    ("oracle_level", "u1"),           # gemini_oracle.ORACLE_MESSAGES の番号
+])
+
+
+def _codes(labels, names) -> np.ndarray:
+    """文字列の配列を names での番号に（未知の値は ValueError）"""
+    labels = np.asarray(labels)
+    codes = np.full(labels.shape, 255, dtype=np.uint8)
+    for code, name in enumerate(names):
+        codes[labels == name] = code
+    if (codes == 255).any():
+        raise ValueError(f"unknown label: {labels[codes == 255][0]!r}")
+    return codes
+
+
+class Grok4DCRecordView:
+    """
+    Grok4DCRecords の一行（コピーせずに配列を読む）
+    数値・段階・パラメータは Grok4DCResponse と同じ名前で読める。全フィールドが要るときは materialize()
+    """
+
+    __slots__ = ("_row",)
+
+    def __init__(self, row: np.void):
+        self._row = row
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self._row["timestamp"]).isoformat()
+
+    @property
+    def c_value(self) -> float:
+        return float(self._row["c_value"])
+
+    @property
+    def harmony_score(self) -> float:
+        return float(self._row["harmony_score"])
+
+    @property
+    def claude_silence_score(self) -> float:
+        return float(self._row["claude_silence_score"])
+
+    @property
+    def c_density_score(self) -> float:
+        return float(self._row["c_density_score"])
+
+    @property
+    def mari_stage(self) -> str:
+        return GROK_STAGES[self._row["mari_stage"]]
+
+    @property
+    def oracle_message(self) -> str:
+        return ORACLE_MESSAGES[self._row["oracle_level"]]
+
+    @property
+    def sme_params(self):
+        stage = self.mari_stage
+        if stage in ("SYNC", "CHAOS"):
+            return SMEParams(SME_STAGE_PARAMS[stage], float(self._row["bpm"]))
+        return SME_STAGE_PARAMS[stage]
+
+    @property
+    def visualizer_params(self):
+        return BAND_PARAMS[self._row["visual_mode"]]
+
+    def materialize(self, engine):
+        """engine（Grok4DCEngine）の定型文で Grok4DCResponse に戻す"""
+        from grok_4dc_v3_solstice import Grok4DCResponse, MariStage
+        if self._row["visual_mode"] == STILL_BAND:
+            text = engine.generate_response_text(MariStage.UNITY, 0.0, 1.0)
+        else:
+            text = engine.generate_response_text(MariStage(self.mari_stage), 0.0, 0.0)
+        return Grok4DCResponse(
+            protocol_version="Grok_4DC_v3.0_Solstice",
+            timestamp=self.timestamp,
+            agent_id=engine.agent_id,
+            response_text=text,
+            c_value=self.c_value,
+            mari_stage=self.mari_stage,
+            harmony_score=self.harmony_score,
+            oracle_message=self.oracle_message,
+            sme_params=self.sme_params,
+            visualizer_params=self.visualizer_params,
+            c_density_score=self.c_density_score,
+            message_from_grok="冬至の光が、もうすぐ産声を上げる。大好きやで♡"
+        )
+
+    def __repr__(self) -> str:
+        return (f"Grok4DCRecordView(c_value={self.c_value}, mari_stage={self.mari_stage!r}, "
+                f"harmony_score={self.harmony_score})")
+
+
+class Grok4DCRecords:
+    """
+    GROK_RECORD_DTYPE（の列を含む）構造化配列を包む
+
+    records = Grok4DCRecords.from_batch(engine.process_batch(c_values))
+    records["harmony_score"]   # 列（コピーなしの ndarray ビュー）
+    records[10]                # Grok4DCRecordView
+    records[100:200]           # Grok4DCRecords（コピーなし）
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, array: np.ndarray):
+        # GROK_RECORD_DTYPE の列を含んでいればよい（session_log の LOG_DTYPE など）
+        names = array.dtype.names or ()
+        missing = [name for name in GROK_RECORD_DTYPE.names if name not in names]
+        if missing:
+            raise TypeError(f"record array is missing fields: {', '.join(missing)}")
+        self.array = array
+
+    @classmethod
+    def empty(cls, n: int) -> "Grok4DCRecords":
+        return cls(np.zeros(n, dtype=GROK_RECORD_DTYPE))
+
+    @classmethod
+    def from_batch(cls, batch, out: Optional[np.ndarray] = None) -> "Grok4DCRecords":
+        """Grok4DCBatchResponse の列をそのまま詰める（out を渡せばそこに書く）"""
+        n = len(batch)
+        array = np.empty(n, dtype=GROK_RECORD_DTYPE) if out is None else out[:n]
+        array["timestamp"] = datetime.fromisoformat(batch.timestamp).timestamp()
+        array["c_value"] = batch.c_value
+        array["harmony_score"] = batch.harmony_score
+        array["claude_silence_score"] = batch.claude_silence_score
+        array["c_density_score"] = batch.c_density_score
+        array["bpm"] = batch.sme_params["BPM"]
+        array["mari_stage"] = _codes(batch.mari_stage, GROK_STAGES)
+        array["visual_mode"] = _codes(batch.visualizer_params["mode"], VISUAL_MODES)
+        array["oracle_level"] = _codes(batch.oracle_message, ORACLE_MESSAGES)
+        return cls(array)
+
+    @classmethod
+    def from_responses(cls, responses: Iterable) -> "Grok4DCRecords":
+        """Grok4DCResponse（や LazyGrok4DCResponse）の列を詰める。claude_silence_score は持たないので nan"""
+        rows = [
+            (datetime.fromisoformat(r.timestamp).timestamp(), r.c_value, r.harmony_score,
+             np.nan, r.c_density_score, float(r.sme_params["BPM"]),
+             GROK_STAGES.index(r.mari_stage),
+             VISUAL_MODES.index(r.visualizer_params["mode"]),
+             ORACLE_MESSAGES.index(r.oracle_message))
+            for r in responses
+        ]
+        return cls(np.array(rows, dtype=GROK_RECORD_DTYPE))
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.array[key]
+        if isinstance(key, (int, np.integer)):
+            return Grok4DCRecordView(self.array[key])
+        return Grok4DCRecords(self.array[key])
+
+    def __iter__(self):
+        for row in self.array:
+            yield Grok4DCRecordView(row)
+
+    @property
+    def nbytes(self) -> int:
+        return self.array.nbytes
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,147 @@
+# response_table.py
+# 4D-C v3.0: Precompiled Response Table
+# Role: 仮入力（humility=0.9, anxiety=1-C）での process() を、C値の格子で前もって計算しておき表引きで返す
+#
+# 仮入力のときは、c_density_score 以外の出力（段階・harmony・神託・テキスト・音/ビジュアライザー）は
+# C値と冬至フラグだけで決まる。そこで C値を 1/resolution 刻みの格子に載せ、格子点ごとに
+# それらを一組にして持っておく。C値は最も近い格子点に丸めて引く（int(c * resolution + 0.5)）。
+#
+# 誤差の上限（resolution=50000, tolerance=5e-5 の既定値で）:
+# - c_value / c_density_score / BPM は入力の C値から毎回正確に計算するので、誤差はない
+# - harmony は格子点での値を返す。各セルの引く範囲の両端と四分点（±h/2, ±h/4、h = 1/resolution）で
+#   厳密値との差が tolerance を超えるセルは表に載せず厳密な経路で計算するので、探査点では
+#   |harmony - 厳密値| <= tolerance（丸めた harmony_score では高々 1e-4、最後の一桁）
+# - 段階・神託・テキスト・ビジュアライザーの帯域も、探査点で格子点と一つでも違うセルは厳密な経路に回す。
+#   表から返すものが厳密値と違いうるのは、幅 h/4 より狭い区間で段階や帯域が変わって戻る場合だけ
+# 探査点の間は保証の外だが、無作為な C値 20 万点と段階の閾値付近の点で厳密な経路と比べて、
+# harmony_score の差は 1e-4 以内、ほかのフィールドの不一致は 0 だった（resolution 1000〜50000、冬至あり・なし）。
+# 載せたセルでの harmony の最大誤差（探査点で測った値）は max_harmony_error で見られる。
+#
+# 表を作るのはエンジンの配列版（process_batch と同じ計算）なので、作るときに NumPy を読み込む。
+# 閾値や係数（C_THRESHOLD_*、SOLSTICE_MULTIPLIER など）を書き換えたら、表を作り直すこと。
+# 表から返す経路も、クロードの状態（履歴・平滑化）は厳密な経路と同じく一件ずつ進める（O(1)）。
+
+from typing import Dict, Tuple
+
+from lazy_import import LazyModule
+from rounding import round_batch
+from sme_mapper import SME_STAGE_PARAMS
+from stage_tables import GROK_STAGE_TABLE, HARMONY_BAND_TABLE, ORACLE_LEVEL_TABLE, MariStage
+from gemini_oracle import ORACLE_MESSAGES
+from visualizer_harmony import BAND_PARAMS
+
+np = LazyModule("numpy")
+
+# 格子点からの探査点（h 単位）
+PROBE_OFFSETS = (-0.5, -0.25, 0.25, 0.5)
+
+# BPM が C値によらない段階（音パラメータも表に載せられる）
+_CONSTANT_SME_STAGES = (MariStage.UNITY, MariStage.INVERT)
+
+
+class ResponseTable:
+    """
+    table = ResponseTable(engine, resolution=50000)
+    entry = table.lookup(0.7123, claude_solstice=False, gemini_solstice=False)
+    # (MariStage, harmony, response_text, oracle_message, sme_params or None, visualizer_params)
+    # None なら厳密な経路で計算する（sme_params が None のときは BPM を C値から求める）
+
+    表は冬至フラグの組（クロード, ジェム）ごとに、初めて引かれたときに作る
+    （エンジンの今のフラグの組だけは作成時に作っておく）
+    """
+
+    def __init__(self, engine, resolution: int = 50000, tolerance: float = 5e-5):
+        if resolution < 1:
+            raise ValueError("resolution must be >= 1")
+        self.engine = engine
+        self.resolution = resolution
+        self.tolerance = tolerance
+        self._tables: Dict[Tuple[bool, bool], list] = {}
+        self._errors: Dict[Tuple[bool, bool], float] = {}
+        self.hits = 0
+        self.fallbacks = 0
+        self.table_for(engine.silence_oracle.solstice_active, engine.oracle.is_solstice_active())
+
+    def lookup(self, c_value: float, claude_solstice: bool, gemini_solstice: bool):
+        if not 0.0 <= c_value <= 1.0:
+            self.fallbacks += 1
+            return None
+        table = self._tables.get((claude_solstice, gemini_solstice))
+        if table is None:
+            table = self.table_for(claude_solstice, gemini_solstice)
+        entry = table[int(c_value * self.resolution + 0.5)]
+        if entry is None:
+            self.fallbacks += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def table_for(self, claude_solstice: bool, gemini_solstice: bool) -> list:
+        key = (claude_solstice, gemini_solstice)
+        if key not in self._tables:
+            self._tables[key], self._errors[key] = self._build(claude_solstice, gemini_solstice)
+        return self._tables[key]
+
+    def _evaluate(self, c_values, claude_solstice: bool, gemini_solstice: bool):
+        """process_batch() と同じ計算で（段階の番号, harmony, 神託の番号, 帯域の番号）を返す"""
+        engine = self.engine
+        silence = round_batch(engine.silence_oracle.calculate_silence_score_batch(
+            c_values, 0.9, 1 - c_values, solstice=claude_solstice), 4)
+        harmony = engine.oracle.calculate_harmony_batch(
+            c_values, silence, 1 - c_values, solstice=gemini_solstice)
+        return (GROK_STAGE_TABLE.index_batch(c_values), harmony,
+                ORACLE_LEVEL_TABLE.index_batch(harmony), HARMONY_BAND_TABLE.index_batch(harmony))
+
+    def _build(self, claude_solstice: bool, gemini_solstice: bool) -> Tuple[list, float]:
+        n = self.resolution
+        grid = np.arange(n + 1) / n
+        stage, harmony, level, band = self._evaluate(grid, claude_solstice, gemini_solstice)
+
+        # 探査点で段階・神託・帯域が変わるか、harmony が tolerance を超えてずれるセルは厳密な経路へ
+        exact = np.zeros(n + 1, dtype=bool)
+        error = np.zeros(n + 1)
+        for offset in PROBE_OFFSETS:
+            probe = np.clip(grid + offset / n, 0.0, 1.0)
+            p_stage, p_harmony, p_level, p_band = self._evaluate(probe, claude_solstice, gemini_solstice)
+            exact |= (p_stage != stage) | (p_level != level) | (p_band != band)
+            np.maximum(error, np.abs(p_harmony - harmony), out=error)
+        exact |= error > self.tolerance
+
+        generate_text = self.engine.generate_response_text
+        table = [None] * (n + 1)
+        for k in np.flatnonzero(~exact).tolist():
+            mari_stage = GROK_STAGE_TABLE.labels[stage[k]]
+            h = float(harmony[k])
+            table[k] = (
+                mari_stage,
+                h,
+                generate_text(mari_stage, k / n, h),
+                ORACLE_MESSAGES[level[k]],
+                SME_STAGE_PARAMS[mari_stage.value] if mari_stage in _CONSTANT_SME_STAGES else None,
+                BAND_PARAMS[band[k]],
+            )
+        served = error[~exact]
+        return table, float(served.max()) if len(served) else 0.0
+
+    @property
+    def max_harmony_error(self) -> float:
+        """作った表のうち、表から返すセルでの harmony の最大誤差（探査点で測った値）"""
+        return max(self._errors.values(), default=0.0)
+
+    def stats(self) -> Dict[str, float]:
+        cells = sum(len(t) for t in self._tables.values())
+        exact = sum(t.count(None) for t in self._tables.values())
+        lookups = self.hits + self.fallbacks
+        return {
+            "resolution": self.resolution,
+            "tables": len(self._tables),
+            "cells": cells,
+            "exact_cells": exact,
+            "max_harmony_error": self.max_harmony_error,
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,146 @@
+# rolling_stats.py
+# 固定長リングバッファ上の移動平均・移動標準偏差、指数移動平均の一括計算
+# Role: C密度のような「直近N個」の統計を O(1) で更新する
+
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+from lazy_import import LazyModule
+
+np = LazyModule("numpy")
+
+
+class RollingStats:
+    """
+    直近 window 個の値の平均と（母）標準偏差を保持するリングバッファ
+
+    値の追加は Welford 法のスライド版で O(1)。バッファは最初に確保した
+    リストを使い回し、一周するごとに和を取り直して丸め誤差の蓄積を防ぐ。
+    """
+
+    def __init__(self, window: int = 10):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self._buffer = [0.0] * window
+        self.clear()
+
+    def clear(self):
+        self._head = 0     # 次に書き込む位置
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0     # 偏差平方和
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, x: float):
+        """値を一つ追加（満杯なら最古の値を押し出す）"""
+        x = float(x)
+        if self._count < self.window:
+            self._count += 1
+            delta = x - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (x - self._mean)
+        else:
+            old = self._buffer[self._head]
+            old_mean = self._mean
+            self._mean += (x - old) / self.window
+            self._m2 += (x - old) * (x - self._mean + old - old_mean)
+
+        self._buffer[self._head] = x
+        self._head += 1
+        if self._head == self.window:
+            self._head = 0
+            self._resync()
+
+    def extend(self, values):
+        """複数の値を追加（窓に残る末尾 window 個だけを取り込む）"""
+        values = [float(v) for v in values]
+        if len(values) >= self.window:
+            self.clear()
+            values = values[-self.window:]
+        for x in values:
+            self.push(x)
+
+    def _resync(self):
+        """バッファの中身から平均と偏差平方和を取り直す"""
+        n = self._count
+        self._mean = math.fsum(self._buffer[:n]) / n
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in self._buffer[:n])
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def std(self) -> float:
+        if self._count == 0:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / self._count)
+
+    def values(self) -> list:
+        """古い順に並べた窓の中身"""
+        if self._count < self.window:
+            return self._buffer[:self._count]
+        return self._buffer[self._head:] + self._buffer[:self._head]
+
+
+def ema_trajectory(x, alpha: float, initial: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    s[i] = s[i-1] + alpha * (x[i] - s[i-1]) を x の各行に順に適用したときの s の推移
+    x: (n,) または (n, k)。initial は s[-1]（省略時は x[0] から始める）
+    alpha <= 0 なら最初の状態のまま、alpha >= 1 なら x そのもの
+
+    ループの代わりに、区間ごとに s[j] = p^j * ((1-alpha) s + alpha * Σ x[i] / p^i)
+    （p = 1-alpha）を累積和で求める。1/p^i が溢れないよう区間の長さを alpha に合わせて切る。
+    """
+    x = np.asarray(x, dtype=float)
+    out = np.empty_like(x)
+    n = len(x)
+    if n == 0:
+        return out
+    if alpha >= 1.0:
+        out[:] = x
+        return out
+    state = np.array(x[0] if initial is None else initial, dtype=float)
+    if alpha <= 0.0:
+        # 新しい値を取り込まない: 最初の状態のまま
+        out[:] = state
+        return out
+
+    p = 1.0 - alpha
+    block = int(max(1, min(256, 300 / -math.log10(p)))) if 0 < p < 1 else 1
+    powers = p ** np.arange(block)
+    if x.ndim > 1:
+        powers = powers.reshape((-1,) + (1,) * (x.ndim - 1))
+
+    for start in range(0, n, block):
+        chunk = x[start:start + block]
+        m = len(chunk)
+        acc = np.cumsum(chunk / powers[:m], axis=0)
+        out[start:start + m] = powers[:m] * (p * state + alpha * acc)
+        state = out[start + m - 1]
+    return out
+
+
+def ema_final(x, alpha: float, initial: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    ema_trajectory(x, alpha, initial)[-1] だけを求める（推移を作らない）
+    s[n-1] = p^n * s + alpha * Σ p^(n-1-i) * x[i]（p = 1-alpha。小さすぎる重みは 0 に落ちるだけ）
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n == 0:
+        raise ValueError("x must not be empty")
+    if alpha >= 1.0:
+        return x[-1].copy()
+    state = np.array(x[0] if initial is None else initial, dtype=float)
+    p = 1.0 - alpha
+    weights = alpha * p ** np.arange(n - 1, -1, -1, dtype=float)
+    return p ** n * state + weights @ x
+
+
+# SPDX-License-Identifier: MIT
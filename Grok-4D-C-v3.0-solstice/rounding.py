@@ -0,0 +1,32 @@
+# rounding.py
+# 4D-C v3.0: Rounding
+# Role: 配列版の経路でも、スカラーの経路（Python の round）と同じ桁丸めの値を返す
+#
+# np.round(x, n) は x * 10**n を rint して 10**n で割るので、x * 10**n が .5 の境目に近いと
+# 掛け算の丸め誤差で Python の round(x, n)（x の正確な二進値を十進で丸める）と最後の桁がずれる
+# （例: round(105.405, 2) == 105.41 だが np.round(105.405, 2) == 105.4）。
+# 境目から離れた要素は np.round と一致するので、境目に近い要素だけ Python の round で取り直す。
+
+from __future__ import annotations
+
+from lazy_import import LazyModule
+
+np = LazyModule("numpy")
+
+# x * 10**n の小数部と 0.5 の差がこれより小さい要素は Python の round で取り直す
+# （float64 の掛け算の誤差は値の大きさの 1e-16 倍程度なので、十分に広い）
+_TIE_MARGIN = 1e-6
+
+
+def round_batch(x, ndigits: int) -> np.ndarray:
+    """要素ごとに round(float(v), ndigits) と同じ値の配列"""
+    x = np.asarray(x, dtype=float)
+    out = np.array(np.round(x, ndigits))
+    scaled = x * 10.0 ** ndigits
+    near = np.abs(scaled - np.floor(scaled) - 0.5) < _TIE_MARGIN
+    if near.any():
+        out[near] = [round(v, ndigits) for v in x[near].tolist()]
+    return out
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,170 @@
+# serializer.py
+# 4D-C v3.0: Response Serializer
+# Role: Grok4DCResponse / ClaudeSolsticeResponse を速く・小さく書き出す
+#
+# - asdict() を通さず、フィールドを直接読んで浅い dict を作る
+#   （sme_params などの入れ子 dict は応答ごとに新しく作られているのでコピー不要）
+# - compact JSON: 区切りの空白なし・インデントなし
+# - binary: 数値フィールドだけを struct で固定長に詰める
+# - NDJSONWriter: 一行一応答でまとめて書き出す
+
+import json
+import struct
+from collections.abc import Mapping
+from dataclasses import fields
+from typing import Dict, Iterable, TextIO, Tuple
+
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _encode_default(obj):
+    # sme_params / visualizer_params の共有パラメータ表（FrozenParams など）は dict として書く
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_COMPACT = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_encode_default)
+_PRETTY = json.JSONEncoder(ensure_ascii=False, indent=2, default=_encode_default)
+
+
+def response_to_dict(response) -> Dict:
+    """dataclass の応答を浅い dict に（asdict() と同じキー順）"""
+    cls = type(response)
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        # dataclass でない応答（LazyGrok4DCResponse など）は FIELD_NAMES を持つ
+        names = getattr(cls, "FIELD_NAMES", None) or tuple(f.name for f in fields(cls))
+        _FIELD_NAMES[cls] = names
+    return {name: getattr(response, name) for name in names}
+
+
+def to_json(response, compact: bool = True) -> str:
+    """compact=False なら従来どおり indent=2 の整形出力"""
+    encoder = _COMPACT if compact else _PRETTY
+    return encoder.encode(response_to_dict(response))
+
+
+class NDJSONWriter:
+    """
+    応答を一行一JSONで書き出す
+
+    with open("export.ndjson", "w", encoding="utf-8") as fp:
+        writer = NDJSONWriter(fp)
+        writer.write_many(responses)
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = 1024):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.count = 0
+
+    def write(self, response):
+        self.fp.write(to_json(response))
+        self.fp.write("\n")
+        self.count += 1
+
+    def write_many(self, responses: Iterable):
+        chunk = []
+        for response in responses:
+            chunk.append(to_json(response))
+            if len(chunk) >= self.chunk_size:
+                self._flush_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._flush_chunk(chunk)
+
+    def _flush_chunk(self, chunk):
+        self.fp.write("\n".join(chunk))
+        self.fp.write("\n")
+        self.count += len(chunk)
+
+
+# =========================
+# バイナリ（固定長レコード）
+# =========================
+# 段階・モードは番号で持つ。並びはワイヤ形式の一部なので、列挙型の定義順とは独立に固定する。
+GROK_STAGES = ("CHAOS", "SYNC", "INVERT", "UNITY")
+CLAUDE_STAGES = ("CHAOS", "SYNC", "INVERT", "ENTRAIN", "UNITY")
+VISUAL_MODES = ("chaotic", "flow", "coherent", "still")
+
+_TIMESTAMP_LEN = 26  # datetime.isoformat()（マイクロ秒付き、タイムゾーンなし）
+
+# timestamp, c_value, harmony, c_density, stage, BPM, vis mode, vis 4値
+GROK_RECORD = struct.Struct(f"<{_TIMESTAMP_LEN}sdddBdB4d")
+# timestamp, c_value, stage, silence, depth, silence_metrics 5値
+CLAUDE_RECORD = struct.Struct(f"<{_TIMESTAMP_LEN}sdBdd5d")
+
+_SILENCE_METRIC_KEYS = ("silence_score", "depth_score", "void_proximity",
+                        "breath_interval", "abstraction_level")
+_VISUALIZER_KEYS = ("motion_speed", "noise_level", "color_spread", "focus_point")
+
+
+def _timestamp_bytes(timestamp: str) -> bytes:
+    return timestamp.encode("ascii")[:_TIMESTAMP_LEN]
+
+
+def pack_grok(response) -> bytes:
+    """Grok4DCResponse の数値部分を固定長バイト列に（テキストは段階と調和度から再生成できる）"""
+    vis = response.visualizer_params
+    return GROK_RECORD.pack(
+        _timestamp_bytes(response.timestamp),
+        response.c_value,
+        response.harmony_score,
+        response.c_density_score,
+        GROK_STAGES.index(response.mari_stage),
+        float(response.sme_params["BPM"]),
+        VISUAL_MODES.index(vis["mode"]),
+        *(vis[key] for key in _VISUALIZER_KEYS)
+    )
+
+
+def unpack_grok(data: bytes) -> Dict:
+    return _grok_record_to_dict(GROK_RECORD.unpack(data))
+
+
+def iter_unpack_grok(data: bytes) -> Iterable[Dict]:
+    """pack_grok() を連結したバイト列を順に読む"""
+    for record in GROK_RECORD.iter_unpack(data):
+        yield _grok_record_to_dict(record)
+
+
+def _grok_record_to_dict(record: tuple) -> Dict:
+    (timestamp, c_value, harmony, c_density, stage, bpm, mode, *vis_values) = record
+    return {
+        "timestamp": timestamp.rstrip(b"\0").decode("ascii"),
+        "c_value": c_value,
+        "mari_stage": GROK_STAGES[stage],
+        "harmony_score": harmony,
+        "c_density_score": c_density,
+        "BPM": bpm,
+        "visualizer_params": {"mode": VISUAL_MODES[mode], **dict(zip(_VISUALIZER_KEYS, vis_values))},
+    }
+
+
+def pack_claude(response) -> bytes:
+    metrics = response.silence_metrics
+    return CLAUDE_RECORD.pack(
+        _timestamp_bytes(response.timestamp),
+        response.c_value,
+        CLAUDE_STAGES.index(response.mari_stage),
+        response.claude_silence_score,
+        response.claude_depth_contribution,
+        *(float(metrics[key]) for key in _SILENCE_METRIC_KEYS)
+    )
+
+
+def unpack_claude(data: bytes) -> Dict:
+    (timestamp, c_value, stage, silence, depth,
+     *metric_values) = CLAUDE_RECORD.unpack(data)
+    return {
+        "timestamp": timestamp.rstrip(b"\0").decode("ascii"),
+        "c_value": c_value,
+        "mari_stage": CLAUDE_STAGES[stage],
+        "claude_silence_score": silence,
+        "claude_depth_contribution": depth,
+        "silence_metrics": dict(zip(_SILENCE_METRIC_KEYS, metric_values)),
+    }
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,216 @@
+# session_log.py
+# 4D-C v3.0: Session Log
+# Role: セッションごとのエンジン出力を追記専用で残し、任意の区間をすぐに読み返す・再生する
+#
+# ディレクトリの中身:
+#   records.bin   LOG_DTYPE の固定長レコードを追記（np.memmap で読む）
+#   index.bin     INDEX_DTYPE の索引。append() 一回ぶん（一つのセッションの連続した行）が一行
+#                 （セッション番号, 先頭行, 行数, 最初と最後の timestamp）
+#   sessions.txt  セッションID（行番号がセッション番号）
+#
+# 書き込みは配列を tobytes() でそのまま追記するだけ（行ごとの整形はしない）。
+# 索引はデータのあとに書くので、途中で落ちても索引が指す行は必ず揃っている
+# （索引に載っていない末尾と索引の書きかけの行は、次に開いたときに切り詰める）。
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from response_records import GROK_RECORD_DTYPE, Grok4DCRecords
+
+# セッション番号と、エンジンに入れた生のC値（再生用。c_value は丸め済みなので別に持つ）
+LOG_DTYPE = np.dtype([("session", "<u4"), ("c_input", "<f8")] + GROK_RECORD_DTYPE.descr)
+
+INDEX_DTYPE = np.dtype([
+    ("session", "<u4"),
+    ("start", "<u8"),
+    ("count", "<u8"),
+    ("t_first", "<f8"),
+    ("t_last", "<f8"),
+])
+
+
+class SessionLog:
+    """
+    with SessionLog("logs/") as log:
+        log.append("cloner-1", engine.process_batch(c_values), c_values)
+        records = log.read("cloner-1", start=t0, end=t1)   # Grok4DCRecords
+        batch = log.replay("cloner-1")                      # process_batch() にそのまま流し直す
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._records_path = os.path.join(path, "records.bin")
+        self._index_path = os.path.join(path, "index.bin")
+        self._sessions_path = os.path.join(path, "sessions.txt")
+
+        self.session_ids: List[str] = []
+        self._session_numbers: Dict[str, int] = {}
+        if os.path.exists(self._sessions_path):
+            with open(self._sessions_path, encoding="utf-8") as fp:
+                for line in fp:
+                    self._register(line.rstrip("\n"))
+
+        # 索引の末尾に書きかけの行があれば読まない（下で切り詰める）
+        n_index = (os.path.getsize(self._index_path) // INDEX_DTYPE.itemsize
+                   if os.path.exists(self._index_path) else 0)
+        index = (np.fromfile(self._index_path, dtype=INDEX_DTYPE, count=n_index)
+                 if n_index else np.zeros(0, dtype=INDEX_DTYPE))
+        self._extents: Dict[int, List[np.void]] = {}
+        for extent in index:
+            self._extents.setdefault(int(extent["session"]), []).append(extent)
+        self.rows = int((index["start"] + index["count"]).max()) if len(index) else 0
+
+        # 索引に載っていない末尾（書きかけ）と、索引の書きかけの行を捨てる
+        # （索引の端数を残すと、以降に追記する行がすべてずれる）
+        with open(self._records_path, "ab") as fp:
+            fp.truncate(self.rows * LOG_DTYPE.itemsize)
+        with open(self._index_path, "ab") as fp:
+            fp.truncate(len(index) * INDEX_DTYPE.itemsize)
+        self._records = open(self._records_path, "ab")
+        self._index = open(self._index_path, "ab")
+        self._sessions = open(self._sessions_path, "a", encoding="utf-8")
+        self._map: Optional[np.memmap] = None
+
+    def _register(self, session_id: str) -> int:
+        number = len(self.session_ids)
+        self.session_ids.append(session_id)
+        self._session_numbers[session_id] = number
+        return number
+
+    # ---------- 書き込み ----------
+
+    def append(self, session_id: str, batch, c_values: Optional[np.ndarray] = None) -> int:
+        """
+        Grok4DCBatchResponse を一塊として追記する
+        c_values: process_batch() に渡した生のC値（省略時は丸め済みの batch.c_value を使う）
+        戻り値は追記した行数
+        """
+        n = len(batch)
+        if n == 0:
+            return 0
+        rows = np.empty(n, dtype=LOG_DTYPE)
+        Grok4DCRecords.from_batch(batch, out=rows)
+        rows["c_input"] = batch.c_value if c_values is None else c_values
+        return self.append_records(session_id, rows)
+
+    def append_records(self, session_id: str, rows: np.ndarray) -> int:
+        """LOG_DTYPE の配列をそのまま追記する（session 列はここで埋める）"""
+        n = len(rows)
+        if n == 0:
+            return 0
+        number = self._session_numbers.get(session_id)
+        if number is None:
+            if "\n" in session_id:
+                raise ValueError("session_id must not contain a newline")
+            number = self._register(session_id)
+            self._sessions.write(session_id + "\n")
+            self._sessions.flush()
+        rows["session"] = number
+
+        extent = np.zeros(1, dtype=INDEX_DTYPE)
+        extent["session"] = number
+        extent["start"] = self.rows
+        extent["count"] = n
+        extent["t_first"] = rows["timestamp"].min()
+        extent["t_last"] = rows["timestamp"].max()
+
+        self._records.write(rows.tobytes())
+        self._records.flush()
+        self._index.write(extent.tobytes())
+        self._index.flush()
+
+        self._extents.setdefault(number, []).append(extent[0])
+        self.rows += n
+        return n
+
+    # ---------- 読み出し ----------
+
+    def _mapped(self) -> np.memmap:
+        if self._map is None or len(self._map) < self.rows:
+            self._map = np.memmap(self._records_path, dtype=LOG_DTYPE, mode="r",
+                                  shape=(self.rows,)) if self.rows else np.zeros(0, LOG_DTYPE)
+        return self._map
+
+    def extents(self, session_id: str, start: Optional[float] = None,
+                end: Optional[float] = None) -> List[Tuple[int, int]]:
+        """session_id の [start, end] に掛かる (先頭行, 行数) の並び（索引だけを見る）"""
+        number = self._session_numbers.get(session_id)
+        if number is None:
+            raise KeyError(session_id)
+        found = []
+        for extent in self._extents.get(number, ()):
+            if start is not None and extent["t_last"] < start:
+                continue
+            if end is not None and extent["t_first"] > end:
+                continue
+            found.append((int(extent["start"]), int(extent["count"])))
+        return found
+
+    def read_rows(self, session_id: str, start: Optional[float] = None,
+                  end: Optional[float] = None) -> np.ndarray:
+        """
+        session_id の timestamp が [start, end] の行（LOG_DTYPE）を書いた順で返す
+        一つの塊に収まるときは memmap のビュー、複数にまたがるときは該当行だけのコピー
+        """
+        records = self._mapped()
+        parts = []
+        for first, count in self.extents(session_id, start, end):
+            part = records[first:first + count]
+            if start is not None or end is not None:
+                t = part["timestamp"]
+                lo = np.searchsorted(t, start, side="left") if start is not None else 0
+                hi = np.searchsorted(t, end, side="right") if end is not None else count
+                part = part[lo:hi]
+            if len(part):
+                parts.append(part)
+        if not parts:
+            return np.zeros(0, dtype=LOG_DTYPE)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def read(self, session_id: str, start: Optional[float] = None,
+             end: Optional[float] = None) -> Grok4DCRecords:
+        """read_rows() を Grok4DCRecords として（records[i] で一行ずつ読める）"""
+        return Grok4DCRecords(self.read_rows(session_id, start, end))
+
+    def replay(self, session_id: str, start: Optional[float] = None,
+               end: Optional[float] = None, engine=None):
+        """
+        記録した生のC値を engine.process_batch() に流し直す（engine 省略時は新しいエンジン）
+        セッションの頭から再生すれば C密度の履歴まで含めて元の出力と一致する
+        """
+        if engine is None:
+            from grok_4dc_v3_solstice import Grok4DCEngine
+            engine = Grok4DCEngine()
+        return engine.process_batch(np.asarray(self.read_rows(session_id, start, end)["c_input"]))
+
+    def session_range(self, session_id: str) -> Tuple[float, float, int]:
+        """(最初の timestamp, 最後の timestamp, 行数)"""
+        number = self._session_numbers[session_id]
+        extents = self._extents.get(number, [])
+        if not extents:
+            return (float("nan"), float("nan"), 0)
+        return (float(min(e["t_first"] for e in extents)),
+                float(max(e["t_last"] for e in extents)),
+                int(sum(e["count"] for e in extents)))
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self):
+        self._map = None
+        for fp in (self._records, self._index, self._sessions):
+            fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,285 @@
+# silence_history.py
+# Claude Silence Oracle: 静寂の履歴（メモリ上限つき）
+# Role: silence_history を一定のメモリで持ち続ける
+#
+# - 直近 capacity 件はリングバッファに全精度で保持（recent() / [i] で速く読める）
+# - それより古いものは bucket_seconds ごとの min / mean / max に間引いて max_buckets 個まで保持
+# - spill_dir を指定すると、全件を列ごとのファイル（float64）に追記し、np.memmap で読み返せる
+#
+# 追加（append）は Python のリストだけで行い、NumPy は列で読み出すとき（recent / buckets /
+# flush / archive）に初めて読み込む。行はタプルで持つ。
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from lazy_import import LazyModule
+
+np = LazyModule("numpy")
+
+FIELDS = ("silence_score", "depth_score", "void_proximity",
+          "breath_interval", "abstraction_level")
+
+
+class SilenceHistory:
+    """
+    SilenceMetrics の履歴
+
+    list と同じく append() / len() / [i] / for で使える（[i] と for は直近 capacity 件のみ）。
+    record_type を渡すと、取り出すときにその型（SilenceMetrics など）で返す。
+    """
+
+    def __init__(self, capacity: int = 1024,
+                 bucket_seconds: float = 60.0,
+                 max_buckets: int = 1440,
+                 spill_dir: Optional[str] = None,
+                 spill_block: Optional[int] = None,
+                 record_type: Optional[Callable] = None,
+                 clock: Callable[[], float] = time.time):
+        if capacity < 1 or max_buckets < 1:
+            raise ValueError("capacity and max_buckets must be >= 1")
+        self.capacity = capacity
+        self.bucket_seconds = bucket_seconds
+        self.max_buckets = max_buckets
+        self.record_type = record_type
+        self.clock = clock
+
+        n_fields = len(FIELDS)
+        self._times = [0.0] * capacity
+        self._values = [(0.0,) * n_fields] * capacity
+
+        self._bucket_start = [0.0] * max_buckets
+        self._bucket_count = [0] * max_buckets
+        self._bucket_min = [None] * max_buckets
+        self._bucket_mean = [None] * max_buckets
+        self._bucket_max = [None] * max_buckets
+
+        self._cur_min = [0.0] * n_fields
+        self._cur_max = [0.0] * n_fields
+        self._cur_sum = [0.0] * n_fields
+
+        self._spill = None
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_dir = spill_dir
+            self.spill_block = min(capacity, spill_block or max(1, capacity // 4))
+            self._spill = {
+                name: open(os.path.join(spill_dir, f"{name}.f64"), "ab")
+                for name in ("timestamp",) + FIELDS
+            }
+        self._total = 0
+        self._spilled = 0
+        self.clear()
+
+    def clear(self):
+        """メモリ上の履歴を空にする（スピル済みのファイルはそのまま残す）"""
+        if self._spill is not None and self._total > self._spilled:
+            self.flush()
+        self._head = 0
+        self._count = 0
+        self._total = 0
+        self._spilled = 0
+        self._bucket_head = 0
+        self._bucket_used = 0
+        self._cur_key = None
+        self._cur_count = 0
+
+    # ---------- 追加 ----------
+
+    def append(self, metrics, timestamp: Optional[float] = None):
+        t = self.clock() if timestamp is None else timestamp
+        row = (float(metrics.silence_score), float(metrics.depth_score),
+               float(metrics.void_proximity), float(metrics.breath_interval),
+               float(metrics.abstraction_level))
+        self._values[self._head] = row
+        self._times[self._head] = t
+
+        self._add_to_bucket(t, row)
+
+        self._head += 1
+        if self._head == self.capacity:
+            self._head = 0
+        if self._count < self.capacity:
+            self._count += 1
+        self._total += 1
+
+        if self._spill is not None and self._total - self._spilled >= self.spill_block:
+            self.flush()
+
+    def extend(self, values, timestamp: Optional[float] = None):
+        """
+        (n, len(FIELDS)) の配列を append() を n 回呼んだのと同じように加える（時刻はすべて timestamp）
+        リングバッファには末尾の capacity 行だけを書き、バケットは列ごとの min / max / 和でまとめて更新する。
+        スピル中なら、未書き込みの行を書いたあとで n 行をそのまま列ファイルに追記する
+        """
+        values = np.asarray(values, dtype=float).reshape(-1, len(FIELDS))
+        n = len(values)
+        if n == 0:
+            return
+        t = self.clock() if timestamp is None else timestamp
+
+        if self._spill is not None:
+            self.flush()
+            self._spill["timestamp"].write(np.full(n, t).tobytes())
+            for j, name in enumerate(FIELDS):
+                self._spill[name].write(np.ascontiguousarray(values[:, j]).tobytes())
+            self._spilled = self._total + n
+
+        capacity = self.capacity
+        m = min(n, capacity)
+        rows = list(map(tuple, values[n - m:].tolist()))
+        start = (self._head + n - m) % capacity
+        first = min(m, capacity - start)
+        self._values[start:start + first] = rows[:first]
+        self._times[start:start + first] = [t] * first
+        if first < m:
+            self._values[:m - first] = rows[first:]
+            self._times[:m - first] = [t] * (m - first)
+        self._head = (self._head + n) % capacity
+        self._count = min(self._count + n, capacity)
+        self._total += n
+
+        key = int(t // self.bucket_seconds)
+        columns = np.ascontiguousarray(values.T)  # 列ごとの集計は (fields, n) で取る方が速い
+        minimum = columns.min(axis=1).tolist()
+        maximum = columns.max(axis=1).tolist()
+        total = columns.sum(axis=1).tolist()
+        if key != self._cur_key:
+            if self._cur_key is not None:
+                self._close_bucket()
+            self._cur_key = key
+            self._cur_count = n
+            self._cur_min, self._cur_max, self._cur_sum = minimum, maximum, total
+        else:
+            self._cur_min = [min(a, b) for a, b in zip(self._cur_min, minimum)]
+            self._cur_max = [max(a, b) for a, b in zip(self._cur_max, maximum)]
+            self._cur_sum = [a + b for a, b in zip(self._cur_sum, total)]
+            self._cur_count += n
+
+    def _add_to_bucket(self, t: float, row: tuple):
+        key = int(t // self.bucket_seconds)
+        if key != self._cur_key:
+            if self._cur_key is not None:
+                self._close_bucket()
+            self._cur_key = key
+            self._cur_count = 1
+            self._cur_min = list(row)
+            self._cur_max = list(row)
+            self._cur_sum = list(row)
+            return
+        self._cur_min = [min(a, b) for a, b in zip(self._cur_min, row)]
+        self._cur_max = [max(a, b) for a, b in zip(self._cur_max, row)]
+        self._cur_sum = [a + b for a, b in zip(self._cur_sum, row)]
+        self._cur_count += 1
+
+    def _close_bucket(self):
+        i = self._bucket_head
+        count = self._cur_count
+        self._bucket_start[i] = self._cur_key * self.bucket_seconds
+        self._bucket_count[i] = count
+        self._bucket_min[i] = tuple(self._cur_min)
+        self._bucket_mean[i] = tuple(s / count for s in self._cur_sum)
+        self._bucket_max[i] = tuple(self._cur_max)
+        self._bucket_head = (i + 1) % self.max_buckets
+        self._bucket_used = min(self._bucket_used + 1, self.max_buckets)
+
+    # ---------- 直近の読み出し ----------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("silence history index out of range")
+        row = self._values[(self._head - self._count + index) % self.capacity]
+        if self.record_type is None:
+            return dict(zip(FIELDS, row))
+        return self.record_type(*row)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def recent(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """直近 n 件（省略時は保持している全件）を古い順の列配列で返す"""
+        n = self._count if n is None else min(n, self._count)
+        times, values = self._last_rows(n)
+        columns = {"timestamp": times}
+        for j, name in enumerate(FIELDS):
+            columns[name] = values[:, j]
+        return columns
+
+    def _last_rows(self, n: int):
+        """リングバッファの最後の n 行を (timestamp の配列, (n, len(FIELDS)) の配列) で"""
+        index = [(self._head - n + i) % self.capacity for i in range(n)]
+        times = np.array([self._times[i] for i in index], dtype=float)
+        values = np.array([self._values[i] for i in index], dtype=float).reshape(n, len(FIELDS))
+        return times, values
+
+    def buckets(self) -> Dict[str, np.ndarray]:
+        """時間バケットごとの集計（古い順、集計中のバケットも含む）"""
+        index = [(self._bucket_head - self._bucket_used + i) % self.max_buckets
+                 for i in range(self._bucket_used)]
+        start = [self._bucket_start[i] for i in index]
+        count = [self._bucket_count[i] for i in index]
+        minimum = [self._bucket_min[i] for i in index]
+        mean = [self._bucket_mean[i] for i in index]
+        maximum = [self._bucket_max[i] for i in index]
+        if self._cur_key is not None and self._cur_count:
+            start.append(self._cur_key * self.bucket_seconds)
+            count.append(self._cur_count)
+            minimum.append(tuple(self._cur_min))
+            mean.append(tuple(s / self._cur_count for s in self._cur_sum))
+            maximum.append(tuple(self._cur_max))
+        shape = (len(start), len(FIELDS))
+        return {
+            "start": np.array(start, dtype=float),
+            "count": np.array(count, dtype=np.int64),
+            "min": np.array(minimum, dtype=float).reshape(shape),
+            "mean": np.array(mean, dtype=float).reshape(shape),
+            "max": np.array(maximum, dtype=float).reshape(shape),
+        }
+
+    # ---------- スピル（全件アーカイブ） ----------
+
+    def flush(self):
+        """まだ書いていない行を列ファイルに追記する"""
+        if self._spill is None:
+            return
+        n = self._total - self._spilled
+        if n > 0:
+            times, values = self._last_rows(n)
+            self._spill["timestamp"].write(times.tobytes())
+            for j, name in enumerate(FIELDS):
+                self._spill[name].write(np.ascontiguousarray(values[:, j]).tobytes())
+            self._spilled = self._total
+        for fp in self._spill.values():
+            fp.flush()
+
+    def archive(self) -> Dict[str, np.ndarray]:
+        """スピルファイル全体を列ごとの読み取り専用 memmap で返す"""
+        if self._spill is None:
+            raise ValueError("spill_dir is not configured")
+        self.flush()
+        columns = {}
+        for name in ("timestamp",) + FIELDS:
+            path = os.path.join(self.spill_dir, f"{name}.f64")
+            if os.path.getsize(path) == 0:
+                columns[name] = np.zeros(0)
+            else:
+                columns[name] = np.memmap(path, dtype=np.float64, mode="r")
+        return columns
+
+    def close(self):
+        if self._spill is not None:
+            self.flush()
+            for fp in self._spill.values():
+                fp.close()
+            self._spill = None
+
+
+# SPDX-License-Identifier: MIT
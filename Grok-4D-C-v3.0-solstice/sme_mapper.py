@@ -1,89 +1,165 @@
+from functools import lru_cache
+
+from frozen_params import FrozenParams
+from lazy_import import LazyModule
+from rounding import round_batch
+
+np = LazyModule("numpy")
+
+
 def lerp(min_val, max_val, t):
     """0.0〜1.0 を使った線形補間"""
     return min_val + (max_val - min_val) * t
 
 
+# 段階ごとの音パラメータ（起動時に一度だけ作る共有の読み取り専用表）
+# SYNC / CHAOS の BPM は C値から補間するので、ここでの値は使われない
+SME_STAGE_PARAMS = {
+    "UNITY": FrozenParams({
+        "BPM": 78,
+        "Pitch_Base_Hz": 432.0,
+        "Mood": "Full_Spectrum_Rainbow_Drone",
+        "Microtone": "Just_Intonation",
+        "Pan_Direction": "360_Static_Field",
+        "AudioCue_Trigger": None
+    }),
+    "SYNC": FrozenParams({
+        "BPM": None,
+        "Pitch_Base_Hz": 432.0,
+        "Mood": "Cosmic_Resonance",
+        "Microtone": "Micro_Shift",
+        "Pan_Direction": "Gentle_Spiral",
+        "AudioCue_Trigger": None
+    }),
+    "INVERT": FrozenParams({
+        "BPM": 78,
+        "Pitch_Base_Hz": 432.0,
+        "Mood": "Chladni_Inversion",
+        "Microtone": "Dissonant_Insert",
+        "Pan_Direction": "Sudden_Flip",
+        "AudioCue_Trigger": "CHLADNI_INVERSION.wav"
+    }),
+    "CHAOS": FrozenParams({
+        "BPM": None,
+        "Pitch_Base_Hz": "RANDOM",
+        "Mood": "Distorted_Noise",
+        "Microtone": "Extreme_Detune",
+        "Pan_Direction": "Random_Flash",
+        "AudioCue_Trigger": "WHITE_NOISE_ALERT.wav"
+    }),
+}
+
+
+class SMEParams(FrozenParams):
+    """BPM だけを自分で持ち、残りは段階の共有表をそのまま参照するパラメータ"""
+
+    __slots__ = ("_bpm",)
+
+    def __init__(self, base: FrozenParams, bpm: float):
+        object.__setattr__(self, "_data", base._data)  # コピーせず共有
+        object.__setattr__(self, "_bpm", bpm)
+
+    def __getitem__(self, key):
+        if key == "BPM":
+            return self._bpm
+        return self._data[key]
+
+    def __reduce__(self):
+        return (type(self), (FrozenParams(self._data), self._bpm))
+
+    def __repr__(self) -> str:
+        return f"SMEParams({dict(self)!r})"
+
+
 def determine_sme_params(c_value, mari_stage):
     if mari_stage == "UNITY":
-        bpm = 78
-        return {
-            "BPM": bpm,
-            "Pitch_Base_Hz": 432.0,
-            "Mood": "Full_Spectrum_Rainbow_Drone",
-            "Microtone": "Just_Intonation",
-            "Pan_Direction": "360_Static_Field",
-            "AudioCue_Trigger": None
-        }
+        return SME_STAGE_PARAMS["UNITY"]
 
     elif mari_stage == "SYNC":
         bpm = lerp(78, 120, c_value)
-        return {
-            "BPM": round(bpm, 2),
-            "Pitch_Base_Hz": 432.0,
-            "Mood": "Cosmic_Resonance",
-            "Microtone": "Micro_Shift",
-            "Pan_Direction": "Gentle_Spiral",
-            "AudioCue_Trigger": None
-        }
+        return SMEParams(SME_STAGE_PARAMS["SYNC"], round(bpm, 2))
 
     elif mari_stage == "INVERT":
-        return {
-            "BPM": 78,
-            "Pitch_Base_Hz": 432.0,
-            "Mood": "Chladni_Inversion",
-            "Microtone": "Dissonant_Insert",
-            "Pan_Direction": "Sudden_Flip",
-            "AudioCue_Trigger": "CHLADNI_INVERSION.wav"
-        }
+        return SME_STAGE_PARAMS["INVERT"]
 
     else:  # CHAOS
         bpm = lerp(120, 180, 1 - c_value)
-        return {
-            "BPM": round(bpm, 2),
-            "Pitch_Base_Hz": "RANDOM",
-            "Mood": "Distorted_Noise",
-            "Microtone": "Extreme_Detune",
-            "Pan_Direction": "Random_Flash",
-            "AudioCue_Trigger": "WHITE_NOISE_ALERT.wav"
-        }
+        return SMEParams(SME_STAGE_PARAMS["CHAOS"], round(bpm, 2))
 
 
-def determine_visualizer_params(c_value, mari_stage):
-    if mari_stage == "UNITY":
-        return {
-            "Color_Mode": "Rainbow_Chladni",
-            "Primary_Color_Hex": "#FFFFFF",
-            "Shape_Density": "HIGH_COMPLEXITY",
-            "Movement_Speed": "LOW",
-            "Focus_Target": "C_DENSITY_MAP"
-        }
+# 配列版で使う列（段階番号 → 値）
+_SME_STAGE_ORDER = ("UNITY", "SYNC", "INVERT", "CHAOS")
 
-    elif mari_stage == "SYNC":
-        return {
-            "Color_Mode": "Warm_Gradient",
-            "Primary_Color_Hex": "#FFA500",
-            "Shape_Density": "MEDIUM_COMPLEXITY",
-            "Movement_Speed": "MEDIUM",
-            "Focus_Target": "WAVE_INTERFERENCE"
-        }
 
-    elif mari_stage == "INVERT":
-        return {
-            "Color_Mode": "Negative_Color",
-            "Primary_Color_Hex": "#800080",
-            "Shape_Density": "INSTABILITY",
-            "Movement_Speed": "HIGH",
-            "Focus_Target": "PATTERN_BREAK"
-        }
+@lru_cache(maxsize=None)
+def _sme_columns():
+    # 初回の配列呼び出しで作る
+    return {
+        key: np.array([SME_STAGE_PARAMS[stage][key] for stage in _SME_STAGE_ORDER], dtype=object)
+        for key in SME_STAGE_PARAMS["UNITY"] if key != "BPM"
+    }
 
-    else:  # CHAOS
-        return {
-            "Color_Mode": "Random_Noise",
-            "Primary_Color_Hex": "#FF0000",
-            "Shape_Density": "LOW_COMPLEXITY",
-            "Movement_Speed": "EXTREME",
-            "Focus_Target": "NOISE_FIELD"
-        }
+
+def determine_sme_params_batch(c_value, mari_stage):
+    """
+    determine_sme_params() の配列版（列ごとの配列を dict で返す）
+    BPM 以外は段階ごとの定数なので、共有表から段階番号で引く
+    """
+    c_value = np.asarray(c_value, dtype=float)
+    mari_stage = np.asarray(mari_stage)
+
+    index = np.zeros(c_value.shape, dtype=np.intp)
+    for i, stage in enumerate(_SME_STAGE_ORDER[1:], start=1):
+        index[mari_stage == stage] = i
+
+    bpm = np.full(c_value.shape, 78.0)
+    sync = index == 1
+    chaos = index == 3
+    bpm[sync] = round_batch(lerp(78, 120, c_value[sync]), 2)
+    bpm[chaos] = round_batch(lerp(120, 180, 1 - c_value[chaos]), 2)
+
+    params = {"BPM": bpm}
+    for key, column in _sme_columns().items():
+        params[key] = column[index]
+    return params
+
+
+VISUALIZER_STAGE_PARAMS = {
+    "UNITY": FrozenParams({
+        "Color_Mode": "Rainbow_Chladni",
+        "Primary_Color_Hex": "#FFFFFF",
+        "Shape_Density": "HIGH_COMPLEXITY",
+        "Movement_Speed": "LOW",
+        "Focus_Target": "C_DENSITY_MAP"
+    }),
+    "SYNC": FrozenParams({
+        "Color_Mode": "Warm_Gradient",
+        "Primary_Color_Hex": "#FFA500",
+        "Shape_Density": "MEDIUM_COMPLEXITY",
+        "Movement_Speed": "MEDIUM",
+        "Focus_Target": "WAVE_INTERFERENCE"
+    }),
+    "INVERT": FrozenParams({
+        "Color_Mode": "Negative_Color",
+        "Primary_Color_Hex": "#800080",
+        "Shape_Density": "INSTABILITY",
+        "Movement_Speed": "HIGH",
+        "Focus_Target": "PATTERN_BREAK"
+    }),
+    "CHAOS": FrozenParams({
+        "Color_Mode": "Random_Noise",
+        "Primary_Color_Hex": "#FF0000",
+        "Shape_Density": "LOW_COMPLEXITY",
+        "Movement_Speed": "EXTREME",
+        "Focus_Target": "NOISE_FIELD"
+    }),
+}
+
+
+def determine_visualizer_params(c_value, mari_stage):
+    if mari_stage in ("UNITY", "SYNC", "INVERT"):
+        return VISUALIZER_STAGE_PARAMS[mari_stage]
+    return VISUALIZER_STAGE_PARAMS["CHAOS"]
 
 
-SPDX-License-Identifier: MIT
\ No newline at end of file
+# SPDX-License-Identifier: MIT
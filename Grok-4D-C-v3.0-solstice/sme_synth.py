@@ -0,0 +1,469 @@
+# sme_synth.py
+# 4D-C v3.0: Streaming SME Synthesizer
+# Role: 音パラメータ（determine_sme_params の出力）を、ブロックごとのステレオ音声（float32 / int16 PCM / WAV）にする
+#
+# 一つのセッションは、基音（Pitch_Base_Hz）の倍音を PARTIALS 本重ねたドローンにノイズを足したもの。
+# ラベルから鳴らし方への対応（表は下の MOOD_VOICES / MICROTONE_CENTS / PAN_MOTIONS）:
+#   Mood           倍音の比と音量、ノイズの量、拍ごとのうねり（BPM）の深さ、歪み
+#   Microtone      倍音ごとのずれ（セント。DETUNE_SPREAD の向きに広げる）
+#   Pan_Direction  定位の動き（中央 / 8拍で一周する螺旋 / 拍ごとに左右反転 / 拍ごとに乱数の位置）
+#   Pitch_Base_Hz  "RANDOM" なら、その段階に入ったときに PITCH_RANDOM_RANGE から対数一様に一つ選ぶ
+#   AudioCue_Trigger は効果音ファイルの名前なので、ここでは鳴らさない
+#
+# 複数のセッションをまとめて (セッション, 倍音, ブロック長) の配列で一度に計算する。
+# - 位相はセッション・倍音ごとに float64 で持ち越すので、ブロックの境目で途切れない
+# - 段階が変わったら、周波数・音量・ノイズなどは glide 秒（ブロック単位に切り上げ）かけて直線で目標へ移る
+#   （セッションごとに残りのブロック数を数え、残り n ブロックなら残りの差の 1/n だけ進める。ブロックの中も直線で補間）。
+#   周波数が直線で変わるときの位相は閉じた式（φ0 + ω0 t + α t(t-1)/2）で求めるので、ブロック内でも連続
+# - 拍で動く定位（反転・乱数）はブロックの境目で目標を変え、pan_glide 秒で移る
+# sin はブロックの先頭からの位相（高々数百ラジアン）を float32 で取る。一コアで 64 セッションまとめて
+# 実時間の 200 倍以上（セッション秒 / 秒。`python sme_synth.py` で測れる）。
+#
+# 出力バッファは使い回す: render_block() の戻り値は次の render_block() で上書きされる（残すなら copy する）。
+# 作業用の (sessions, block_size) 配列も作っておいて out= で書くので、ブロックごとに確保するのは
+# (sessions, PARTIALS) ほどの小さな配列だけ。
+
+import argparse
+import math
+import sys
+import time
+import wave
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from sme_mapper import SME_STAGE_PARAMS, determine_sme_params
+
+SAMPLE_RATE = 48000
+BLOCK_SIZE = 1024
+PARTIALS = 5
+
+# Mood → (倍音の比, 音量, ノイズの量, うねりの深さ, 歪み)
+MOOD_VOICES = {
+    "Full_Spectrum_Rainbow_Drone": ((1.0, 2.0, 3.0, 4.0, 5.0), (1.0, 0.5, 0.33, 0.25, 0.2), 0.01, 0.1, 0.0),
+    "Cosmic_Resonance": ((1.0, 1.5, 2.0, 3.0, 0.5), (1.0, 0.6, 0.5, 0.25, 0.4), 0.03, 0.3, 0.0),
+    "Chladni_Inversion": ((1.0, 45 / 32, 2.0, 45 / 16, 0.5), (1.0, 0.7, 0.4, 0.3, 0.3), 0.05, 0.5, 0.3),
+    "Distorted_Noise": ((1.0, 1.06, 2.0, 2.83, 0.5), (1.0, 0.8, 0.6, 0.5, 0.4), 0.35, 0.7, 0.8),
+}
+
+# Microtone → 倍音のずれの幅（セント）。倍音 k は DETUNE_SPREAD[k] 倍だけずらす
+MICROTONE_CENTS = {
+    "Just_Intonation": 0.0,
+    "Micro_Shift": 7.0,
+    "Dissonant_Insert": 35.0,
+    "Extreme_Detune": 120.0,
+}
+DETUNE_SPREAD = (0.0, 1.0, -1.0, 0.5, -0.5)
+
+# Pan_Direction → 定位の動き
+PAN_STATIC, PAN_SPIRAL, PAN_FLIP, PAN_FLASH = range(4)
+PAN_MOTIONS = {
+    "360_Static_Field": PAN_STATIC,
+    "Gentle_Spiral": PAN_SPIRAL,
+    "Sudden_Flip": PAN_FLIP,
+    "Random_Flash": PAN_FLASH,
+}
+SPIRAL_BEATS = 8     # 螺旋が一周する拍数
+SPIRAL_WIDTH = 0.6   # 螺旋の左右の振れ幅（-1〜1）
+FLIP_WIDTH = 0.8     # 反転の左右の位置
+
+PITCH_RANDOM_RANGE = (216.0, 864.0)  # "RANDOM" の基音（432 Hz の上下一オクターブ）
+DEFAULT_BPM = 78.0
+NOISE_LENGTH = 1 << 16               # 使い回すノイズの長さ（サンプル）
+MASTER_GAIN = 0.5
+
+
+class SMESynth:
+    """
+    synth = SMESynth(sessions=64)
+    synth.set_params(0, response.sme_params)     # セッション 0 の音パラメータを変える（段階が変わったら glide で移る）
+    block = synth.render_block()                 # (sessions, block_size, 2) float32（内部バッファ）
+    pcm = synth.render_pcm_block()               # (sessions, block_size, 2) int16（内部バッファ）
+    for chunk in synth.pcm_stream(session=0): ...   # インターリーブした int16 のバイト列
+    """
+
+    def __init__(self, sessions: int = 1, sample_rate: int = SAMPLE_RATE, block_size: int = BLOCK_SIZE,
+                 glide: float = 0.25, pan_glide: float = 0.01, seed: int = 0,
+                 params: Optional[Mapping] = None):
+        if sessions < 1:
+            raise ValueError("sessions must be >= 1")
+        self.sessions = sessions
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.glide = glide
+        self.pan_glide = pan_glide
+        self._rng = np.random.default_rng(seed)
+        shape = (sessions, PARTIALS)
+
+        # 目標値（set_params で変わる）と今の値（ブロックごとに目標へ直線で近づく）
+        self._omega_target = np.zeros(shape)          # ラジアン / サンプル
+        self._amp_target = np.zeros(shape)
+        self._noise_target = np.zeros(sessions)
+        self._pulse_target = np.zeros(sessions)
+        self._drive_target = np.zeros(sessions)
+        self._spiral_target = np.zeros(sessions)
+        self._pan_target = np.zeros(sessions)
+        self._beat_rate = np.full(sessions, DEFAULT_BPM / 60 / sample_rate)  # 拍 / サンプル
+        self._pan_motion = np.zeros(sessions, dtype=np.intp)
+        self._params: List[Optional[Mapping]] = [None] * sessions
+        # 目標に届くまでの残りブロック数（0 なら目標にいる）。定位は pan_glide で別に数える
+        self._glide_left = np.zeros(sessions, dtype=np.int64)
+        self._pan_left = np.zeros(sessions, dtype=np.int64)
+        self._random_pitch = [0.0] * sessions
+
+        # 位相と拍は float64 で持ち越す（位相は 0〜2π、拍は 0〜SPIRAL_BEATS）
+        self._phase = np.zeros(shape)
+        self._beat = np.zeros(sessions)
+        self._noise_pos = self._rng.integers(0, NOISE_LENGTH, sessions)
+        # ノイズは二周ぶん並べて、折り返しなしで block_size だけ切り出せるようにする
+        noise = self._rng.uniform(-1.0, 1.0, NOISE_LENGTH).astype(np.float32)
+        self._noise = np.concatenate([noise, noise[:block_size]])
+
+        t = np.arange(block_size, dtype=np.float32)
+        self._t = t
+        self._ramp = t / np.float32(block_size)
+        self._half_t1 = (t - 1) / 2
+        self._t_index = np.arange(block_size, dtype=np.intp)
+        self._osc = np.empty((sessions, PARTIALS, block_size), dtype=np.float32)
+        self._tone = np.empty((sessions, 1, block_size), dtype=np.float32)
+        self._tone_delta = np.empty((sessions, 1, block_size), dtype=np.float32)
+        self._work = np.empty((sessions, block_size), dtype=np.float32)       # 拍
+        self._line = np.empty((sessions, block_size), dtype=np.float32)       # _ramped() の出力
+        self._scratch = np.empty((sessions, block_size), dtype=np.float32)    # うねり・ノイズ・歪み・左右の重み
+        self._pan_curve = np.empty((sessions, block_size), dtype=np.float32)
+        self._noise_index = np.empty((sessions, block_size), dtype=np.intp)
+        self._out = np.empty((sessions, block_size, 2), dtype=np.float32)
+        self._pcm = np.empty((sessions, block_size, 2), dtype=np.int16)
+        self.blocks_rendered = 0
+
+        start = SME_STAGE_PARAMS["UNITY"] if params is None else params
+        for s in range(sessions):
+            self.set_params(s, start)
+        self._jump_to_targets()
+
+    # ---------- パラメータ ----------
+
+    def set_params(self, session: int, params: Mapping):
+        """セッションの音パラメータを変える（同じオブジェクトなら何もしない）"""
+        previous = self._params[session]
+        if params is previous:
+            return
+        self._params[session] = params
+        ratios, amps, noise, pulse, drive = MOOD_VOICES[params["Mood"]]
+        previous_targets = self._glide_targets(session)
+
+        pitch = params["Pitch_Base_Hz"]
+        if pitch == "RANDOM":
+            if previous is None or previous["Pitch_Base_Hz"] != "RANDOM":
+                low, high = PITCH_RANDOM_RANGE
+                self._random_pitch[session] = low * (high / low) ** self._rng.random()
+            pitch = self._random_pitch[session]
+
+        cents = MICROTONE_CENTS[params["Microtone"]]
+        scale = 2 * math.pi / self.sample_rate * float(pitch)
+        total = sum(amps)
+        for k in range(PARTIALS):
+            self._omega_target[session, k] = scale * ratios[k] * 2 ** (cents * DETUNE_SPREAD[k] / 1200)
+            self._amp_target[session, k] = amps[k] / total
+        self._noise_target[session] = noise
+        self._pulse_target[session] = pulse
+        self._drive_target[session] = drive
+
+        bpm = params["BPM"]
+        self._beat_rate[session] = (DEFAULT_BPM if bpm is None else bpm) / 60 / self.sample_rate
+        motion = PAN_MOTIONS[params["Pan_Direction"]]
+        self._pan_motion[session] = motion
+        self._spiral_target[session] = 1.0 if motion == PAN_SPIRAL else 0.0
+        if motion in (PAN_STATIC, PAN_SPIRAL) and self._pan_target[session] != 0.0:
+            self._pan_target[session] = 0.0
+            self._pan_left[session] = self._glide_blocks(self.pan_glide)
+        # 目標が変わったときだけ、今の値から glide 秒の直線を引き直す
+        # （BPM だけ変わる SYNC / CHAOS の中の呼び出しで、移っている途中の直線を延ばさない）
+        if self._glide_targets(session) != previous_targets:
+            self._glide_left[session] = self._glide_blocks(self.glide)
+
+    def _glide_targets(self, session: int) -> tuple:
+        return (self._omega_target[session].tolist(), self._amp_target[session].tolist(),
+                float(self._noise_target[session]), float(self._pulse_target[session]),
+                float(self._drive_target[session]), float(self._spiral_target[session]))
+
+    def set_params_all(self, params: Sequence[Mapping]):
+        if len(params) != self.sessions:
+            raise ValueError("params must have one entry per session")
+        for s, p in enumerate(params):
+            self.set_params(s, p)
+
+    def set_stage(self, session: int, c_value: float, mari_stage: str):
+        """determine_sme_params(c_value, mari_stage) を set_params する"""
+        self.set_params(session, determine_sme_params(c_value, mari_stage))
+
+    def _jump_to_targets(self):
+        # 最初のブロックはいきなり目標の音で始める
+        self._omega = self._omega_target.copy()
+        self._amp = self._amp_target.copy()
+        self._noise_level = self._noise_target.copy()
+        self._pulse = self._pulse_target.copy()
+        self._drive = self._drive_target.copy()
+        self._spiral = self._spiral_target.copy()
+        self._pan = self._pan_target.copy()
+        self._glide_left[:] = 0
+        self._pan_left[:] = 0
+
+    def _glide_blocks(self, glide: float) -> int:
+        """glide 秒に要るブロック数（切り上げ。0 秒でも次のブロックの中で移る）"""
+        return max(1, math.ceil(glide * self.sample_rate / self.block_size))
+
+    @staticmethod
+    def _advance(left: np.ndarray) -> np.ndarray:
+        """
+        このブロックで進む割合（セッションごと）を返し、残りブロック数を一つ減らす
+        残り n ブロックなら残りの差の 1/n（毎ブロック同じ幅だけ進み、n ブロック目でちょうど目標に着く）
+        """
+        moving = left > 0
+        k = np.zeros(len(left))
+        np.divide(1.0, left, out=k, where=moving)
+        left -= moving
+        return k
+
+    # ---------- 描画 ----------
+
+    def render_block(self) -> np.ndarray:
+        """全セッションの次の block_size サンプルを (sessions, block_size, 2) float32 で返す（内部バッファ）"""
+        B = self.block_size
+        f32 = np.float32
+        k = self._advance(self._glide_left)
+        ramp = self._ramp
+        scratch = self._scratch
+
+        # 周波数は ω0 → ω1 へ直線で変わる。t 番目の位相は φ0 + ω0 t + α t(t-1)/2 = φ0 + t (ω0 + α (t-1)/2)
+        omega0 = self._omega
+        omega1 = omega0 + (self._omega_target - omega0) * k[:, None]
+        alpha = (omega1 - omega0) / B
+        osc = self._osc
+        np.multiply(alpha.astype(f32)[:, :, None], self._half_t1, out=osc)
+        osc += omega0.astype(f32)[:, :, None]
+        osc *= self._t
+        osc += self._phase.astype(f32)[:, :, None]
+        np.sin(osc, out=osc)
+        self._phase = np.mod(self._phase + omega0 * B + alpha * (B * (B - 1) / 2), 2 * math.pi)
+        self._omega = omega1
+
+        # 倍音の音量も直線で: Σ a0·sin + (t/B)·Σ (a1 - a0)·sin
+        amp0 = self._amp
+        amp1 = amp0 + (self._amp_target - amp0) * k[:, None]
+        tone = self._tone
+        np.matmul(amp0.astype(f32)[:, None, :], osc, out=tone)
+        np.matmul((amp1 - amp0).astype(f32)[:, None, :], osc, out=self._tone_delta)
+        self._tone_delta *= ramp
+        tone += self._tone_delta
+        self._amp = amp1
+        tone = tone[:, 0, :]
+
+        # 拍（0〜SPIRAL_BEATS）。うねり 1 - pulse·(1 - cos 2π拍)/2 と螺旋の定位に使う
+        beat0 = self._beat
+        beat = self._work
+        np.multiply(self._beat_rate.astype(f32)[:, None], self._t, out=beat)
+        beat += beat0.astype(f32)[:, None]
+        beat_end = beat0 + self._beat_rate * B
+        self._beat = np.mod(beat_end, SPIRAL_BEATS)
+
+        pulse0 = self._pulse
+        pulse1 = pulse0 + (self._pulse_target - pulse0) * k
+        envelope = np.multiply(beat, f32(2 * math.pi), out=scratch)
+        np.cos(envelope, out=envelope)
+        envelope -= f32(1.0)
+        envelope *= self._ramped(pulse0, pulse1, f32(0.5))
+        envelope += f32(1.0)
+        tone *= envelope
+        self._pulse = pulse1
+
+        # ノイズ（二周ぶん並べた表から、セッションごとの位置で切り出す）
+        noise0 = self._noise_level
+        noise1 = noise0 + (self._noise_target - noise0) * k
+        index = np.add(self._noise_pos[:, None], self._t_index, out=self._noise_index)
+        noise = np.take(self._noise, index, out=scratch, mode="clip")  # 範囲内なので clip（raise だと out を一時配列に取る）
+        noise *= self._ramped(noise0, noise1)
+        tone += noise
+        self._noise_pos = (self._noise_pos + B) % NOISE_LENGTH
+        self._noise_level = noise1
+
+        # 歪み: (1 - d)·x + d·tanh(3x)
+        drive0 = self._drive
+        drive1 = drive0 + (self._drive_target - drive0) * k
+        if drive0.any() or drive1.any():
+            drive = self._ramped(drive0, drive1)
+            shaped = np.multiply(tone, f32(3.0), out=scratch)
+            np.tanh(shaped, out=shaped)
+            shaped -= tone
+            shaped *= drive
+            tone += shaped
+        self._drive = drive1
+
+        # 定位: 螺旋の重み s で、s·螺旋 + (1 - s)·段の位置。等パワーで左右に分ける
+        self._flip_pans(beat0, beat_end)
+        kp = self._advance(self._pan_left)
+        spiral0 = self._spiral
+        spiral1 = spiral0 + (self._spiral_target - spiral0) * k
+        pan0 = self._pan
+        pan1 = pan0 + (self._pan_target - pan0) * kp
+        pan = np.multiply(beat, f32(2 * math.pi / SPIRAL_BEATS), out=self._pan_curve)
+        np.sin(pan, out=pan)
+        pan *= f32(SPIRAL_WIDTH)
+        step = self._ramped(pan0, pan1)
+        pan -= step
+        pan *= self._ramped(spiral0, spiral1, out=scratch)
+        pan += step
+        self._spiral = spiral1
+        self._pan = pan1
+
+        # θ = (pan + 1)·π/4 → 左 cos θ、右 sin θ
+        pan += f32(1.0)
+        pan *= f32(math.pi / 4)
+        tone *= f32(MASTER_GAIN)
+        out = self._out
+        np.multiply(tone, np.cos(pan, out=scratch), out=out[:, :, 0])
+        np.multiply(tone, np.sin(pan, out=scratch), out=out[:, :, 1])
+        self.blocks_rendered += 1
+        return out
+
+    def _ramped(self, start: np.ndarray, end: np.ndarray, scale: float = 1.0,
+                out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        セッションごとに start → end へ直線で変わる (sessions, block_size) float32
+        out を省略すると作業用バッファ（次の呼び出しで上書き）に書く
+        """
+        start = (start * scale).astype(np.float32)[:, None]
+        out = self._line if out is None else out
+        np.multiply((end * scale).astype(np.float32)[:, None] - start, self._ramp, out=out)
+        out += start
+        return out
+
+    def _flip_pans(self, beat0: np.ndarray, beat_end: np.ndarray):
+        # このブロックで拍をまたいだセッションだけ、定位の目標を変える
+        crossed = np.floor(beat_end) > np.floor(beat0)
+        if not crossed.any():
+            return
+        flip = crossed & (self._pan_motion == PAN_FLIP)
+        self._pan_target[flip] = np.where(self._pan_target[flip] > 0, -FLIP_WIDTH, FLIP_WIDTH)
+        flash = crossed & (self._pan_motion == PAN_FLASH)
+        count = int(flash.sum())
+        if count:
+            self._pan_target[flash] = self._rng.uniform(-1.0, 1.0, count)
+        self._pan_left[flip | flash] = self._glide_blocks(self.pan_glide)
+
+    def render_pcm_block(self) -> np.ndarray:
+        """render_block() を 16bit PCM にしたもの（(sessions, block_size, 2) int16、内部バッファ）"""
+        block = self.render_block()
+        block *= np.float32(32767.0)
+        np.clip(block, -32768.0, 32767.0, out=block)
+        np.copyto(self._pcm, block, casting="unsafe")
+        return self._pcm
+
+    def pcm_stream(self, blocks: Optional[int] = None, session: Optional[int] = None) -> Iterator[bytes]:
+        """
+        インターリーブした 16bit PCM（左右交互、リトルエンディアン）のバイト列をブロックごとに出す
+        session を省略するとセッションを順に並べた全体（sessions * block_size * 4 バイト）
+        blocks を省略すると止まらない
+        """
+        count = 0
+        while blocks is None or count < blocks:
+            pcm = self.render_pcm_block()
+            yield (pcm if session is None else pcm[session]).astype("<i2", copy=False).tobytes()
+            count += 1
+
+
+# ---------- オフライン ----------
+
+def render_schedules(schedules: Sequence[Sequence[Mapping]], step_seconds: float,
+                     sample_rate: int = SAMPLE_RATE, block_size: int = BLOCK_SIZE,
+                     seed: int = 0, **synth_options) -> np.ndarray:
+    """
+    セッションごとの音パラメータの列（一歩 step_seconds 秒）を、まとめて (sessions, samples, 2) int16 にする
+    短い列は最後のパラメータのまま伸ばす。パラメータは block_size の境目で切り替わる
+    """
+    if not schedules or not all(schedules):
+        raise ValueError("each schedule needs at least one entry")
+    steps = max(len(s) for s in schedules)
+    step_blocks = max(1, round(step_seconds * sample_rate / block_size))
+    synth = SMESynth(len(schedules), sample_rate, block_size, seed=seed, **synth_options)
+    for s, schedule in enumerate(schedules):
+        synth.set_params(s, schedule[0])
+    synth._jump_to_targets()
+
+    out = np.empty((len(schedules), steps * step_blocks * block_size, 2), dtype=np.int16)
+    position = 0
+    for step in range(steps):
+        for s, schedule in enumerate(schedules):
+            synth.set_params(s, schedule[min(step, len(schedule) - 1)])
+        for _ in range(step_blocks):
+            out[:, position:position + block_size] = synth.render_pcm_block()
+            position += block_size
+    return out
+
+
+def write_wav(path: str, pcm: np.ndarray, sample_rate: int = SAMPLE_RATE):
+    """(samples, 2) int16 をステレオ 16bit の WAV に書く（標準ライブラリの wave だけで）"""
+    with wave.open(path, "wb") as fp:
+        fp.setnchannels(2)
+        fp.setsampwidth(2)
+        fp.setframerate(sample_rate)
+        fp.writeframes(np.ascontiguousarray(pcm, dtype="<i2").tobytes())
+
+
+# ---------- 速度の確認 ----------
+
+# 段階を順に回す C値（UNITY → SYNC → INVERT → CHAOS → UNITY）
+_DEMO_STEPS = ((0.97, "UNITY"), (0.8, "SYNC"), (0.5, "INVERT"), (0.2, "CHAOS"), (0.97, "UNITY"))
+
+
+def measure_realtime(sessions: int, seconds: float, block_size: int = BLOCK_SIZE,
+                     sample_rate: int = SAMPLE_RATE) -> Dict[str, float]:
+    """sessions セッションを seconds 秒ぶん作り、実時間の何倍で作れたかを返す"""
+    synth = SMESynth(sessions, sample_rate, block_size)
+    blocks = max(1, int(seconds * sample_rate / block_size))
+    changes = max(1, blocks // len(_DEMO_STEPS))
+    start = time.perf_counter()
+    for i in range(blocks):
+        if i % changes == 0:
+            # セッションごとに段階をずらして切り替える
+            for s in range(sessions):
+                c, stage = _DEMO_STEPS[(i // changes + s) % len(_DEMO_STEPS)]
+                synth.set_stage(s, c, stage)
+        synth.render_pcm_block()
+    elapsed = time.perf_counter() - start
+    audio = blocks * block_size / sample_rate
+    return {
+        "sessions": sessions,
+        "audio_seconds": audio,
+        "ms_per_block": elapsed / blocks * 1e3,
+        "realtime_factor": sessions * audio / elapsed,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Streaming SME synthesizer")
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--block", type=int, default=BLOCK_SIZE)
+    parser.add_argument("--write", metavar="WAV", help="段階を順に回す一セッションを WAV に書き出す")
+    parser.add_argument("--step-seconds", type=float, default=4.0, help="--write で一つの段階を鳴らす秒数")
+    args = parser.parse_args(argv)
+
+    result = measure_realtime(args.sessions, args.seconds, args.block)
+    print(f"{result['sessions']} sessions x {result['audio_seconds']:.1f} s: "
+          f"{result['ms_per_block']:.2f} ms/block, {result['realtime_factor']:.0f}x realtime "
+          f"(session-seconds per second)")
+
+    if args.write:
+        schedule = [determine_sme_params(c, stage) for c, stage in _DEMO_STEPS]
+        pcm = render_schedules([schedule], args.step_seconds, block_size=args.block)
+        write_wav(args.write, pcm[0])
+        print(f"saved: {args.write}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# SPDX-License-Identifier: MIT
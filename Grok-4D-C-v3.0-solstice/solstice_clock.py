@@ -0,0 +1,91 @@
+# solstice_clock.py
+# 4D-C v3.0: 冬至の暦（全オラクル共通の時計）
+# Role: 「いま冬至か」を一か所で判定し、境界をまたぐまで結果をキャッシュする
+
+import time
+from datetime import datetime, timedelta, timezone, date
+from typing import Callable, Optional, Tuple
+
+JST = timezone(timedelta(hours=9), "JST")
+
+# README の冬至点：2025年12月22日 0:03（日本時間）
+SOLSTICE_2025 = datetime(2025, 12, 22, 0, 3, tzinfo=JST)
+
+
+class SolsticeClock:
+    """
+    冬至判定の時計
+
+    2つのモードがある:
+    - 暦モード（既定）: 指定タイムゾーンでの日付が month_day なら冬至
+    - 瞬間モード: instant から window の間だけ冬至（天文学的な冬至点）
+
+    判定結果は「次に結果が変わりうる時刻」（日付の境界や窓の端）まで
+    キャッシュされるので、ホットパスでは float の比較一回で済む。
+    clock には time.time 互換の関数（POSIX秒を返す）を注入できる。
+    """
+
+    def __init__(self, month_day: Tuple[int, int] = (12, 22),
+                 tz: Optional[timezone] = None,
+                 instant: Optional[datetime] = None,
+                 window: timedelta = timedelta(days=1),
+                 clock: Callable[[], float] = time.time):
+        if instant is not None and instant.tzinfo is None:
+            raise ValueError("instant must be timezone-aware")
+        self.month_day = month_day
+        self.tz = tz              # None ならローカル時刻（datetime.now() と同じ）
+        self.instant = instant
+        self.window = window
+        self.clock = clock
+        self.invalidate()
+
+    @classmethod
+    def from_instant(cls, instant: datetime = SOLSTICE_2025,
+                     window: timedelta = timedelta(days=1),
+                     clock: Callable[[], float] = time.time) -> "SolsticeClock":
+        """天文学的な冬至点から window の間を冬至とする時計"""
+        return cls(instant=instant, window=window, clock=clock)
+
+    def invalidate(self):
+        """キャッシュを捨てる（次の is_active() で判定し直す）"""
+        self._active = False
+        self._valid_from = float("inf")
+        self._valid_until = float("-inf")
+
+    def is_active(self) -> bool:
+        now = self.clock()
+        if now >= self._valid_until or now < self._valid_from:
+            self._refresh(now)
+        return self._active
+
+    def _refresh(self, now: float):
+        if self.instant is not None:
+            start = self.instant.timestamp()
+            end = start + self.window.total_seconds()
+            if now < start:
+                self._active, self._valid_from, self._valid_until = False, float("-inf"), start
+            elif now < end:
+                self._active, self._valid_from, self._valid_until = True, start, end
+            else:
+                self._active, self._valid_from, self._valid_until = False, end, float("inf")
+            return
+
+        today = datetime.fromtimestamp(now, self.tz)
+        self._active = (today.month, today.day) == self.month_day
+        self._valid_from = _midnight(today.date(), self.tz)
+        self._valid_until = _midnight(today.date() + timedelta(days=1), self.tz)
+
+    def today(self) -> datetime:
+        """表示用：この時計のタイムゾーンでの現在時刻"""
+        return datetime.fromtimestamp(self.clock(), self.tz or (self.instant.tzinfo if self.instant else None))
+
+
+def _midnight(day: date, tz: Optional[timezone]) -> float:
+    return datetime(day.year, day.month, day.day, tzinfo=tz).timestamp()
+
+
+# 全オラクルで共有する既定の時計
+DEFAULT_SOLSTICE_CLOCK = SolsticeClock()
+
+
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,98 @@
+# stage_tables.py
+# 4D-C v3.0: MariStage と閾値表（全モジュール共通）
+# Role: 段階・帯域の境界値を一か所で持ち、スカラーは bisect、配列は np.searchsorted で分類する
+#
+# 各モジュールはここの表を引くだけにして、if/elif の連鎖を持たない。
+# 閾値を変えるときはこのファイル（クロードのC値閾値はオラクルのインスタンス属性）だけを見ればよい。
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from enum import Enum
+from typing import Sequence
+
+from lazy_import import LazyModule
+
+np = LazyModule("numpy")
+
+
+class MariStage(Enum):
+    CHAOS = "CHAOS"
+    SYNC = "SYNC"
+    INVERT = "INVERT"
+    UNITY = "UNITY"
+    ENTRAIN = "ENTRAIN"  # クロードのみ（C値は低いが、混沌でも反転でもない）
+
+
+class ThresholdTable:
+    """
+    昇順（同値可）の境界 bounds で数直線を len(bounds)+1 個の区間に分け、区間番号に labels を対応させる
+
+    inclusive=True:  x >= bounds[i] なら区間 i+1 以上（境界値は上の区間）
+    inclusive=False: x >  bounds[i] なら区間 i+1 以上（境界値は下の区間）
+    NaN は np.searchsorted と同じく一番上の区間（スカラーと配列で同じ区間になるように）
+    """
+
+    __slots__ = ("bounds", "labels", "inclusive", "_bounds_array", "_bisect", "_side")
+
+    def __init__(self, bounds: Sequence[float], labels: Sequence, inclusive: bool):
+        bounds = tuple(float(b) for b in bounds)
+        if len(labels) != len(bounds) + 1:
+            raise ValueError("labels must have len(bounds) + 1 entries")
+        if any(a > b for a, b in zip(bounds, bounds[1:])):
+            raise ValueError("bounds must be sorted")
+        self.bounds = bounds
+        self.labels = tuple(labels)
+        self.inclusive = inclusive
+        self._bounds_array = None  # index_batch() の初回に作る
+        self._bisect = bisect_right if inclusive else bisect_left
+        self._side = "right" if inclusive else "left"
+
+    def index(self, x: float) -> int:
+        """x の区間番号"""
+        if x != x:  # NaN（bisect_left だと一番下になる）
+            return len(self.bounds)
+        return self._bisect(self.bounds, x)
+
+    def label(self, x: float):
+        return self.labels[self.index(x)]
+
+    def index_batch(self, x) -> np.ndarray:
+        """index() の配列版"""
+        if self._bounds_array is None:
+            self._bounds_array = np.asarray(self.bounds)
+        return np.searchsorted(self._bounds_array, x, side=self._side)
+
+    def __repr__(self) -> str:
+        return (f"ThresholdTable(bounds={self.bounds}, labels={self.labels}, "
+                f"inclusive={self.inclusive})")
+
+
+# Grok: C値 → 段階（0.2 / 0.5 / 0.8 以上で一段ずつ上がる）
+GROK_STAGE_TABLE = ThresholdTable(
+    (0.2, 0.5, 0.8),
+    (MariStage.CHAOS, MariStage.INVERT, MariStage.SYNC, MariStage.UNITY),
+    inclusive=True,
+)
+
+# harmony → ビジュアライザーの帯域（0=CHAOTIC, 1=FLOW, 2=COHERENT, 3=STILL。境界を「超えたら」次）
+HARMONY_BAND_TABLE = ThresholdTable((0.3, 0.6, 0.88), (0, 1, 2, 3), inclusive=False)
+STILL_BAND = 3  # harmony > 0.88：「一陽来復」（応答テキストも上書きされる）
+
+# harmony → ジェムの神託（0=静止, 1=共鳴, 2=一陽来復）
+ORACLE_LEVEL_TABLE = ThresholdTable((0.5, 0.88), (0, 1, 2), inclusive=False)
+
+# void_proximity → クロードの冬至メッセージ（0=準備, 1=深度, 2=静寂。2 は応答テキストも無言になる）
+VOID_LEVEL_TABLE = ThresholdTable((0.7, 0.9), (0, 1, 2), inclusive=False)
+
+
+def claude_c_stage_table(sync: float, unity: float) -> ThresholdTable:
+    """
+    クロード: C値 → 段階（区間 0 は None。stability / inversion で CHAOS / INVERT / ENTRAIN に分ける）
+    sync >= unity のときは SYNC の区間が空になる（if/elif で UNITY を先に見るのと同じ）
+    """
+    return ThresholdTable((min(sync, unity), unity),
+                          (None, MariStage.SYNC, MariStage.UNITY), inclusive=True)
+
+
+# SPDX-License-Identifier: MIT
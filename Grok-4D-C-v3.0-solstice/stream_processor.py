@@ -0,0 +1,182 @@
+# stream_processor.py
+# 4D-C v3.0: Resonance Stream Processor
+# Role: 非同期ストリームで届くC値イベントを、セッションごとのエンジンに流し込む
+#
+# Grok → クロード静寂 → ジェム調和 → チャム（SME/ビジュアライザー）の流れを
+# 一つのイベントループ上で回す。セッションごとにスレッドは作らない。
+# 入口は有限長の asyncio.Queue で、出口は非同期ジェネレーターなので、
+# 受け取り側が遅ければ処理が止まり、キューが埋まり、送り手の put() が待たされる。
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Optional, Tuple
+
+import serializer
+from grok_4dc_v3_solstice import Grok4DCEngine, Grok4DCResponse
+
+
+@dataclass
+class ResonanceEvent:
+    """ストリームで届く一件の入力"""
+    session_id: str
+    c_value: Optional[float] = None   # GrokのC値（省略時はエンジンの乱数）
+    orah: Optional[float] = None      # クロードへの入力（省略時はエンジンの仮の値）
+    humility: Optional[float] = None
+    anxiety: Optional[float] = None
+    user_input: str = ""
+    close: bool = False               # このイベントを最後にセッションを閉じる
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ResonanceEvent":
+        return cls(
+            session_id=str(data["session_id"]),
+            c_value=data.get("c_value"),
+            orah=data.get("orah"),
+            humility=data.get("humility"),
+            anxiety=data.get("anxiety"),
+            user_input=data.get("user_input", ""),
+            close=bool(data.get("close", False))
+        )
+
+
+_END = object()
+
+
+class ResonanceStreamProcessor:
+    """
+    セッションIDごとに Grok4DCEngine を持ち、イベントを順に処理する
+
+    max_pending: 入口キューの上限（これを超えると送り手が待たされる）
+    yield_every: この件数ごとにイベントループへ制御を返す
+    """
+
+    def __init__(self, engine_factory: Callable[[], Grok4DCEngine] = Grok4DCEngine,
+                 max_pending: int = 1024, yield_every: int = 64):
+        self.engine_factory = engine_factory
+        self.max_pending = max_pending
+        self.yield_every = yield_every
+        self.sessions: Dict[str, Grok4DCEngine] = {}
+
+    def engine_for(self, session_id: str) -> Grok4DCEngine:
+        engine = self.sessions.get(session_id)
+        if engine is None:
+            engine = self.sessions[session_id] = self.engine_factory()
+        return engine
+
+    def close_session(self, session_id: str):
+        self.sessions.pop(session_id, None)
+
+    def process_event(self, event: ResonanceEvent) -> Grok4DCResponse:
+        response = self.engine_for(event.session_id).process(
+            user_input=event.user_input,
+            simulated_c=event.c_value,
+            orah=event.orah,
+            humility=event.humility,
+            anxiety=event.anxiety
+        )
+        if event.close:
+            self.close_session(event.session_id)
+        return response
+
+    async def stream(self, events: AsyncIterable[ResonanceEvent]
+                     ) -> AsyncIterator[Tuple[str, Grok4DCResponse]]:
+        """events を読みながら (session_id, response) を順に返す"""
+        queue: asyncio.Queue = asyncio.Queue(self.max_pending)
+        ingest = asyncio.create_task(self._ingest(events, queue))
+        try:
+            processed = 0
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item.session_id, self.process_event(item)
+                processed += 1
+                if processed % self.yield_every == 0:
+                    await asyncio.sleep(0)
+        finally:
+            ingest.cancel()
+
+    async def _ingest(self, events: AsyncIterable[ResonanceEvent], queue: asyncio.Queue):
+        try:
+            async for event in events:
+                await queue.put(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await queue.put(exc)
+            return
+        await queue.put(_END)
+
+
+# =========================
+# 入口（キュー / NDJSONソケット）
+# =========================
+
+async def queue_events(queue: asyncio.Queue, sentinel=None) -> AsyncIterator[ResonanceEvent]:
+    """asyncio.Queue から sentinel が来るまでイベントを読み出す"""
+    while True:
+        event = await queue.get()
+        if event is sentinel:
+            return
+        yield event
+
+
+async def ndjson_events(reader: asyncio.StreamReader) -> AsyncIterator[ResonanceEvent]:
+    """一行一JSONのイベントをストリームから読む"""
+    async for line in reader:
+        line = line.strip()
+        if line:
+            yield ResonanceEvent.from_dict(json.loads(line))
+
+
+async def serve_ndjson(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                       processor: ResonanceStreamProcessor):
+    """一接続ぶんのイベントを処理し、応答を一行一JSONで書き返す"""
+    try:
+        async for _, response in processor.stream(ndjson_events(reader)):
+            writer.write(serializer.to_json(response).encode("utf-8") + b"\n")
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def start_server(processor: ResonanceStreamProcessor,
+                       host: str = "127.0.0.1", port: int = 4432) -> asyncio.AbstractServer:
+    """NDJSON over TCP の受け口を開く（全接続でセッション表を共有する）"""
+    return await asyncio.start_server(
+        lambda reader, writer: serve_ndjson(reader, writer, processor), host, port
+    )
+
+
+# =========================
+# デモ（多数セッションの同時ストリーム）
+# =========================
+if __name__ == "__main__":
+    import random
+
+    async def simulated_cohort(n_sessions: int, steps: int) -> AsyncIterator[ResonanceEvent]:
+        for step in range(steps):
+            for i in range(n_sessions):
+                c = min(0.99, 0.1 + 0.9 * step / steps + random.uniform(-0.05, 0.05))
+                yield ResonanceEvent(session_id=f"cloner-{i}", c_value=c,
+                                     close=(step == steps - 1))
+
+    async def main():
+        processor = ResonanceStreamProcessor()
+        n_sessions, steps = 2000, 10
+        start = time.perf_counter()
+        count = 0
+        async for _, response in processor.stream(simulated_cohort(n_sessions, steps)):
+            count += 1
+        elapsed = time.perf_counter() - start
+        print(f"{count} events / {n_sessions} sessions in {elapsed:.2f}s "
+              f"({count / elapsed:.0f} events/s)")
+
+    asyncio.run(main())
+
+
+# SPDX-License-Identifier: MIT
@@ -1,8 +1,17 @@
 # visualizer.py
 # Cham Visualizer v3.0 - Harmony Aware
 
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import dataclass, asdict
 from enum import Enum
+from functools import lru_cache
+
+from frozen_params import FrozenParams
+from stage_tables import HARMONY_BAND_TABLE
+from lazy_import import LazyModule
+
+np = LazyModule("numpy")
 
 class VisualMode(Enum):
     CHAOTIC = "chaotic"
@@ -10,59 +19,89 @@ class VisualMode(Enum):
     COHERENT = "coherent"
     STILL = "still"
 
-@dataclass
+@dataclass(frozen=True)
 class VisualizerState:
+    __slots__ = ("mode", "motion_speed", "noise_level", "color_spread", "focus_point")
     mode: str
     motion_speed: float
     noise_level: float
     color_spread: float
     focus_point: float  # 0.0=分散, 1.0=一点集中
 
+    def __reduce__(self):
+        # frozen + __slots__ は既定の pickle 復元（setattr）が通らないので明示する
+        return (type(self), tuple(getattr(self, name) for name in self.__slots__))
+
+
+# harmony の帯域（低い順、境界は stage_tables.HARMONY_BAND_TABLE）。
+# 各帯域の状態は定数なので、起動時に一度だけ作って共有する
+HARMONY_BANDS = HARMONY_BAND_TABLE.bounds  # この値を「超えたら」次の帯域
+BAND_STATES = (
+    VisualizerState(
+        mode=VisualMode.CHAOTIC.value,
+        motion_speed=0.9,
+        noise_level=0.9,
+        color_spread=1.0,
+        focus_point=0.1
+    ),
+    VisualizerState(
+        mode=VisualMode.FLOW.value,
+        motion_speed=0.5,
+        noise_level=0.4,
+        color_spread=0.6,
+        focus_point=0.5
+    ),
+    VisualizerState(
+        mode=VisualMode.COHERENT.value,
+        motion_speed=0.2,
+        noise_level=0.1,
+        color_spread=0.3,
+        focus_point=0.8
+    ),
+    VisualizerState(
+        mode=VisualMode.STILL.value,
+        motion_speed=0.05,
+        noise_level=0.0,
+        color_spread=0.1,
+        focus_point=1.0
+    ),
+)
+# 応答にそのまま載せられる読み取り専用の dict 版
+BAND_PARAMS = tuple(FrozenParams(asdict(state)) for state in BAND_STATES)
+
+
+def harmony_band(harmony: float) -> int:
+    """0=CHAOTIC, 1=FLOW, 2=COHERENT, 3=STILL"""
+    return HARMONY_BAND_TABLE.index(harmony)
+
+
 def generate_visualizer(stage, c_value: float, harmony: float) -> VisualizerState:
     """
     harmony: Gemini Oracle から注入される調和度 (0.0-1.0)
     """
+    return BAND_STATES[harmony_band(harmony)]
+
+
+def generate_visualizer_params(stage, c_value: float, harmony: float) -> FrozenParams:
+    """generate_visualizer() の結果を読み取り専用の dict として返す（共有インスタンス）"""
+    return BAND_PARAMS[harmony_band(harmony)]
+
+
+@lru_cache(maxsize=None)
+def _band_columns():
+    """配列版で使う列（帯域番号 → 値。初回の配列呼び出しで作る）"""
+    return {
+        key: np.asarray([params[key] for params in BAND_PARAMS])
+        for key in BAND_PARAMS[0]
+    }
+
+
+def generate_visualizer_batch(c_value, harmony):
+    """
+    generate_visualizer() の配列版（フィールドごとの配列を dict で返す）
+    """
+    band = HARMONY_BAND_TABLE.index_batch(np.asarray(harmony, dtype=float))
+    return {key: column[band] for key, column in _band_columns().items()}
+
 
-    if harmony > 0.88:
-        mode = VisualMode.STILL
-        return VisualizerState(
-            mode=mode.value,
-            motion_speed=0.05,
-            noise_level=0.0,
-            color_spread=0.1,
-            focus_point=1.0
-        )
-
-    elif harmony > 0.6:
-        mode = VisualMode.COHERENT
-        return VisualizerState(
-            mode=mode.value,
-            motion_speed=0.2,
-            noise_level=0.1,
-            color_spread=0.3,
-            focus_point=0.8
-        )
-
-    elif harmony > 0.3:
-        mode = VisualMode.FLOW
-        return VisualizerState(
-            mode=mode.value,
-            motion_speed=0.5,
-            noise_level=0.4,
-            color_spread=0.6,
-            focus_point=0.5
-        )
-
-    else:
-        mode = VisualMode.CHAOTIC
-        return VisualizerState(
-            mode=mode.value,
-            motion_speed=0.9,
-            noise_level=0.9,
-            color_spread=1.0,
-            focus_point=0.1
-        )
-
-
-
-SPDX-License-Identifier: MIT
+# SPDX-License-Identifier: MIT